@@ -0,0 +1,90 @@
+"""Time each odds-page parser backend on saved comparer pages.
+
+Usage: python benchmarks/bench_parser.py [page.html ...] [--repeat N] [--memory]
+
+Without arguments the pages in benchmarks/fixtures/ are used. Every backend's
+game cards are checked against the BeautifulSoup parser before it is timed.
+--memory also parses each page once per backend in a fresh process and reports how
+far that raised the process's peak RSS, which counts lxml's C allocations too.
+For the whole pipeline at larger scales see bench_pipeline.py.
+"""
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import odds_parser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def time_parser(parse, html_content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(parse(html_content))
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def peak_rss_kb():
+    # VmHWM belongs to this process image; ru_maxrss (the fallback off Linux) can carry
+    # over the parent's peak across exec
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            return int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def parse_peak_rss(name, path):
+    """Growth in MB of this process's peak RSS while backend name parses the page at path."""
+    logging.disable(logging.CRITICAL)
+    with open(path, encoding='utf-8') as f:
+        html_content = f.read()
+    before = peak_rss_kb()
+    list(odds_parser.PARSERS[name](html_content))
+    return (peak_rss_kb() - before) / 1024
+
+def peak_rss(name, path):
+    # A fresh process per run, since the peak never goes down
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(parse_peak_rss, name, path).result()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='Saved HTML pages (defaults to benchmarks/fixtures/*.html)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per backend; the fastest is reported')
+    parser.add_argument('--memory', action='store_true', help='Also report the peak RSS growth of each backend')
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    backends = [name for name in odds_parser.PARSERS if name != 'lxml' or odds_parser.lxml_html is not None]
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'page':<28} {'games':>6} " + ' '.join(f"{name:>10}" for name in backends))
+    for path in pages:
+        with open(path, encoding='utf-8') as f:
+            html_content = f.read()
+
+        expected = list(odds_parser.iter_games_bs4(html_content))
+        timings = []
+        for name in backends:
+            cards = list(odds_parser.PARSERS[name](html_content))
+            if cards != expected:
+                sys.exit(f"{name} parser produced different rows for {path}")
+            timings.append(time_parser(odds_parser.PARSERS[name], html_content, args.repeat))
+
+        print(f"{os.path.basename(path):<28} {len(expected):>6} " +
+              ' '.join(f"{t * 1000:>8.1f}ms" for t in timings))
+        if args.memory:
+            print(f"{'  peak RSS':<28} {'':>6} " +
+                  ' '.join(f"{peak_rss(name, path):>8.1f}MB" for name in backends))
+
+if __name__ == "__main__":
+    main()
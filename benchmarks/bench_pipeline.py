@@ -0,0 +1,200 @@
+"""Time parse_html_to_table, clean_table, process_results and sync_data on synthetic slates.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scales 1 10 100] [--repeat 3] [--bookmakers 10]
+    python benchmarks/bench_pipeline.py --compare [BASE [HEAD]]
+
+Each scale's slate (see synthetic.py) runs in a scratch working directory: pages are
+parsed and cleaned in memory, the cleaned odds become that day's game_odds file and
+the scores payloads are put in the scores cache, so process_results never calls the
+API. A team alias file naming every synthetic team is written first, as a running
+pipeline has one; --cold-teams leaves it out to time indexing unseen names.
+Every stage runs --repeat times and keeps the fastest wall time, then runs once more
+under tracemalloc for its peak memory (Python and NumPy allocations; Arrow's own
+memory pool is not counted).
+
+One JSON line per (scale, stage) is appended to benchmarks/results/pipeline.jsonl
+with the commit it ran on. --compare prints two commits' numbers side by side, the
+last two commits in the file by default.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'scripts'))
+
+import pandas as pd
+
+import scores_client
+import synthetic
+import team_index
+from odds_parser import parse_html_to_table
+from results import MAX_DAYS_FROM, process_results
+from save_odds import clean_table
+from sports import SPORT_KEY_MAP
+from sync import sync_data
+
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results', 'pipeline.jsonl')
+STAGES = ['parse', 'clean', 'results', 'sync']
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return commit + ('-dirty' if git('status', '--porcelain', '--untracked-files=no') else '')
+
+def measure(run, repeat):
+    """Fastest wall time of run() over repeat calls, its peak traced memory in MB, and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak / 1e6, result
+
+def bench_scale(scale, date_str, bookmakers, repeat, cold_teams=False):
+    """[(stage, rows in, input MB, wall s, peak MB)] for one slate, run in the current directory."""
+    slate = synthetic.make_slate(scale, date_str, bookmakers)
+    pages = {sport: synthetic.comparer_page(sport, games) for sport, games in slate.items()}
+    os.makedirs('data', exist_ok=True)
+    teams = team_index.TeamIndex()
+    for sport, games in slate.items():
+        scores_client.write_cache(SPORT_KEY_MAP[sport], MAX_DAYS_FROM, date_str, synthetic.scores_payload(sport, games))
+        for game in games:
+            teams.add(sport, game['home'])
+            teams.add(sport, game['away'])
+    if not cold_teams:
+        # A running pipeline already knows most teams from data/team_aliases.csv
+        teams.to_frame().to_csv(team_index.ALIASES_FILE, index=False)
+    page_mb = sum(len(page.encode('utf-8')) for page in pages.values()) / 1e6
+
+    wall, peak, tables = measure(lambda: {sport: parse_html_to_table(page) for sport, page in pages.items()}, repeat)
+    parsed_rows = sum(len(table) for table in tables.values())
+    rows = [('parse', parsed_rows, page_mb, wall, peak)]
+
+    wall, peak, cleaned = measure(lambda: [clean_table(table, sport) for sport, table in tables.items()], repeat)
+    rows.append(('clean', parsed_rows, None, wall, peak))
+
+    odds_df = pd.concat(cleaned, ignore_index=True)
+    odds_df['Compiled_At'] = f'{date_str[:4]}-{date_str[4:6]}-{date_str[6:]} 09:00:00'
+    odds_file = f'data/game_odds_{date_str}.csv'
+    odds_df.to_csv(odds_file, index=False)
+    odds_mb = os.path.getsize(odds_file) / 1e6
+
+    def pipeline_stage(function):
+        def run():
+            # A fresh team index each time, as in a new process
+            team_index._index = None
+            with contextlib.redirect_stdout(io.StringIO()):
+                if not function(date_str):
+                    raise RuntimeError(f"{function.__name__} failed for {date_str}")
+        return run
+
+    for stage, function in (('results', process_results), ('sync', sync_data)):
+        wall, peak, _ = measure(pipeline_stage(function), repeat)
+        rows.append((stage, len(odds_df), odds_mb, wall, peak))
+    return rows
+
+def run_benchmarks(scales, date_str, bookmakers, repeat, results_file, cold_teams=False):
+    commit = git_commit()
+    recorded_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    logging.disable(logging.CRITICAL)
+    # Keep the scratch directory's cache even if SCORES_CACHE_DIR points elsewhere
+    scores_client.CACHE_DIR = os.path.join('data', 'cache', 'scores')
+
+    print(f"{'scale':>6} {'stage':<8} {'rows':>9} {'wall':>10} {'rows/s':>12} {'MB/s':>7} {'peak':>9}")
+    records = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as scratch:
+            cwd = os.getcwd()
+            os.chdir(scratch)
+            try:
+                rows = bench_scale(scale, date_str, bookmakers, repeat, cold_teams)
+            finally:
+                os.chdir(cwd)
+        for stage, rows_in, input_mb, wall, peak in rows:
+            record = {
+                'commit': commit, 'recorded_at': recorded_at, 'python': platform.python_version(),
+                'pandas': pd.__version__, 'scale': scale, 'bookmakers': bookmakers, 'cold_teams': cold_teams,
+                'stage': stage, 'rows': rows_in, 'input_mb': round(input_mb, 3) if input_mb else None,
+                'wall_s': round(wall, 5), 'rows_per_s': round(rows_in / wall),
+                'mb_per_s': round(input_mb / wall, 2) if input_mb else None, 'peak_mb': round(peak, 2)
+            }
+            records.append(record)
+            print(f"{scale:>5g}x {stage:<8} {rows_in:>9} {wall * 1000:>8.1f}ms {record['rows_per_s']:>12,} "
+                  f"{record['mb_per_s'] or '':>7} {peak:>7.1f}MB")
+
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with open(results_file, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    print(f"Appended {len(records)} results for {commit} to {results_file}")
+
+def compare(results_file, commits):
+    with open(results_file, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    seen = list(dict.fromkeys(record['commit'] for record in records))
+    if len(commits) >= 2:
+        base, head = commits[:2]
+    elif commits and seen:
+        base, head = commits[0], seen[-1]
+    elif len(seen) >= 2:
+        base, head = seen[-2:]
+    else:
+        sys.exit(f"Need results from two commits to compare, {results_file} has {seen}")
+
+    # Runs compare within the same slate settings; the latest run of each wins
+    def setup(record):
+        return record['scale'], record['bookmakers'], record.get('cold_teams', False)
+
+    latest = {(record['commit'], setup(record), record['stage']): record for record in records}
+    print(f"{'slate':>14} {'stage':<8} {base:>14} {head:>14} {'change':>8} {'peak ' + base:>16} {'peak ' + head:>16}")
+    for scale, bookmakers, cold_teams in sorted({setup(record) for record in records}):
+        label = f"{scale:g}x/{bookmakers}bk{' cold' if cold_teams else ''}"
+        for stage in STAGES:
+            old = latest.get((base, (scale, bookmakers, cold_teams), stage))
+            new = latest.get((head, (scale, bookmakers, cold_teams), stage))
+            if not old or not new:
+                continue
+            change = (new['wall_s'] / old['wall_s'] - 1) * 100
+            print(f"{label:>14} {stage:<8} {old['wall_s'] * 1000:>12.1f}ms {new['wall_s'] * 1000:>12.1f}ms "
+                  f"{change:>+7.1f}% {old['peak_mb']:>14.1f}MB {new['peak_mb']:>14.1f}MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100], help='Slate sizes to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage; the fastest is recorded')
+    parser.add_argument('--bookmakers', type=int, default=10, help='Bookmakers pricing every game')
+    parser.add_argument('--date', default='20250315', help='Synthetic game date (YYYYMMDD)')
+    parser.add_argument('--cold-teams', action='store_true',
+                        help='Start without a team alias file, so every team name is new')
+    parser.add_argument('--results', default=RESULTS_FILE, help='JSONL file to append to / compare from')
+    parser.add_argument('--compare', nargs='*', metavar='COMMIT',
+                        help='Compare two commits (default: the last two in the results file) instead of running')
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        compare(args.results, args.compare)
+    else:
+        run_benchmarks(args.scales, args.date, args.bookmakers, args.repeat, args.results, args.cold_teams)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Synthetic comparer-site pages and the-odds-api scores payloads for benchmarks.
+
+A slate is a list of games per sport. Each game gets made-up team names, a kickoff
+on the target date and one moneyline per bookmaker, priced from a fair probability
+plus a bookmaker margin. comparer_page() renders a sport's games with the odds site's
+Tailwind markup (the same classes as benchmarks/fixtures/*.html), and scores_payload()
+renders them as the /scores/ endpoint returns them. Draw sports get a Draw block
+and can end level.
+
+Scale 1 is a busy weekday. 10x and 100x multiply every sport's game count, so 100x
+is well past a March Madness Saturday.
+
+Usage:
+    python benchmarks/synthetic.py OUT_DIR [--scale 10] [--date 20250315] [--bookmakers 10]
+
+writes OUT_DIR/pages/<sport key>.html and OUT_DIR/scores/<sport key>.json.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sports import DRAW_SPORTS, SPORT_KEY_MAP
+
+# Games per sport at scale 1
+BASE_SLATE = {'NBA': 10, 'NHL': 12, 'NCAAB': 40, 'EPL': 10, 'Serie A - Italy': 8}
+BOOKMAKERS = ['DraftKings', 'FanDuel', 'BetMGM', 'Caesars', 'BetRivers', 'Bovada', 'BetUS',
+              'BetOnline.ag', 'LowVig.ag', 'MyBookie.ag', 'Fanatics']
+
+SYLLABLES = ['al', 'bra', 'cor', 'den', 'el', 'far', 'gra', 'hol', 'is', 'jun', 'kel', 'lor', 'mon',
+             'nor', 'os', 'pra', 'quin', 'ros', 'sal', 'tor', 'ul', 'val', 'wes', 'yor', 'zan']
+MASCOTS = ['Hawks', 'Bears', 'Comets', 'Foxes', 'Rangers', 'Pilots', 'Owls', 'Tigers', 'Mariners',
+           'Wolves', 'Knights', 'Herons', 'Rockets', 'Bison', 'Lynx', 'Titans', 'Vipers', 'Stags']
+
+PAGE_HEAD = ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Sportsbook Odds Comparer</title>'
+             '</head><body><main class="flex flex-col">\n')
+PAGE_TAIL = '</main></body></html>\n'
+GAME_HEAD = ('<div class="m-5 flex flex-col shadow-lg"><div class="flex flex-col items-center p-4">'
+             '<h2 class="text-3xl">{home} vs {away}</h2><p class="text-cyan-700 text-sm">{kickoff}</p></div>\n')
+OUTCOME_HEAD = ('<div class="flex flex-col items-center"><span class="text-2xl font-semibold">{team}</span>'
+                '<div class="flex flex-row justify-around p-6 bg-white flex-wrap">\n')
+PRICE = ('<div class="grid grid-flow-row p-3"><span class="text-lg">{price} ML</span>'
+         '<span class="text-xl">{bookmaker}</span></div>\n')
+
+def bookmaker_names(count):
+    return BOOKMAKERS[:count] + [f'Book {i + 1}' for i in range(len(BOOKMAKERS), count)]
+
+def team_names(rng, count):
+    names = set()
+    while len(names) < count:
+        city = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        names.add(f'{city} {rng.choice(MASCOTS)}')
+    return sorted(names, key=lambda _: rng.random())
+
+def american(decimal):
+    # Nearest American price to a decimal one, as the site shows it ('+150', '-120')
+    if decimal >= 2:
+        return f'+{round((decimal - 1) * 100)}'
+    return f'-{round(100 / (decimal - 1))}'
+
+def make_slate(scale=1, date_str='20250315', bookmakers=10, seed=0, incomplete=0.02):
+    """{sport: [game]} with teams, a UTC kickoff on date_str, prices per bookmaker and a final score.
+
+    incomplete is the share of (game, bookmaker) lines that leave out one outcome,
+    as half-updated pages do; clean_table drops those lines.
+    """
+    rng = random.Random(seed)
+    books = bookmaker_names(bookmakers)
+    day = datetime.strptime(date_str, '%Y%m%d').replace(tzinfo=timezone.utc)
+    slate = {}
+    for sport, base_games in BASE_SLATE.items():
+        n_games = max(1, round(base_games * scale))
+        teams = team_names(rng, 2 * n_games)
+        draw = sport in DRAW_SPORTS
+        games = []
+        for i in range(n_games):
+            # 16:00-23:45 UTC keeps the New York date equal to date_str
+            kickoff = day + timedelta(hours=16, minutes=15 * rng.randrange(32))
+            home_p = rng.uniform(0.2, 0.75)
+            draw_p = rng.uniform(0.2, 0.3) if draw else 0.0
+            fair = [home_p * (1 - draw_p), (1 - home_p) * (1 - draw_p)] + ([draw_p] if draw else [])
+            prices = {}
+            for book in books:
+                margin = 1 + rng.uniform(0.03, 0.07)
+                line = [american(max(1.01, 1 / (p * margin * rng.uniform(0.98, 1.02)))) for p in fair]
+                if rng.random() < incomplete:
+                    line[rng.randrange(len(line))] = None
+                prices[book] = line
+            home_score, away_score = rng.randint(0, 4), rng.randint(0, 4)
+            if not draw and home_score == away_score:
+                home_score += 1
+            if sport in ('NBA', 'NCAAB'):
+                home_score, away_score = home_score + rng.randint(60, 110), away_score + rng.randint(60, 110)
+                if home_score == away_score:
+                    away_score += 1
+            games.append({
+                'id': hashlib.md5(f'{seed}:{sport}:{date_str}:{i}'.encode()).hexdigest(),
+                'home': teams[2 * i], 'away': teams[2 * i + 1], 'kickoff': kickoff,
+                'prices': prices, 'scores': (home_score, away_score)
+            })
+        slate[sport] = games
+    return slate
+
+def comparer_page(sport, games):
+    """The odds site's moneyline page for one sport's games."""
+    parts = [PAGE_HEAD]
+    outcomes = ['home', 'away'] + (['Draw'] if sport in DRAW_SPORTS else [])
+    for game in games:
+        parts.append(GAME_HEAD.format(home=game['home'], away=game['away'],
+                                      kickoff=game['kickoff'].strftime('%b %d, %Y, %I:%M %p')))
+        for k, outcome in enumerate(outcomes):
+            parts.append(OUTCOME_HEAD.format(team=game.get(outcome, outcome)))
+            for book, line in game['prices'].items():
+                if line[k] is not None:
+                    parts.append(PRICE.format(price=line[k], bookmaker=book))
+            parts.append('</div></div>\n')
+        parts.append('</div>\n')
+    parts.append(PAGE_TAIL)
+    return ''.join(parts)
+
+def scores_payload(sport, games):
+    """The /scores/ response for one sport's games, all completed."""
+    payload = []
+    for game in games:
+        home_score, away_score = game['scores']
+        payload.append({
+            'id': game['id'],
+            'sport_key': SPORT_KEY_MAP[sport],
+            'sport_title': sport,
+            'commence_time': game['kickoff'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'completed': True,
+            'home_team': game['home'],
+            'away_team': game['away'],
+            'scores': [{'name': game['home'], 'score': str(home_score)},
+                       {'name': game['away'], 'score': str(away_score)}],
+            'last_update': (game['kickoff'] + timedelta(hours=3)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+    return payload
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic comparer pages and scores payloads')
+    parser.add_argument('out_dir')
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--date', default='20250315', help='Game date (YYYYMMDD)')
+    parser.add_argument('--bookmakers', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    slate = make_slate(args.scale, args.date, args.bookmakers, args.seed)
+    os.makedirs(os.path.join(args.out_dir, 'pages'), exist_ok=True)
+    os.makedirs(os.path.join(args.out_dir, 'scores'), exist_ok=True)
+    for sport, games in slate.items():
+        key = SPORT_KEY_MAP[sport]
+        with open(os.path.join(args.out_dir, 'pages', f'{key}.html'), 'w', encoding='utf-8') as f:
+            f.write(comparer_page(sport, games))
+        with open(os.path.join(args.out_dir, 'scores', f'{key}.json'), 'w', encoding='utf-8') as f:
+            json.dump(scores_payload(sport, games), f)
+        print(f"{sport}: {len(games)} games")
+
+if __name__ == "__main__":
+    main()
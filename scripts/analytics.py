@@ -0,0 +1,176 @@
+"""Bookmaker efficiency: vig, no-vig probabilities, calibration, Brier score and log-loss.
+
+Every saved odds row is paired with its game's result over the whole history in one
+vectorized pass (store datasets when available, otherwise the per-day CSVs), then:
+
+- implied probability of each outcome is 1 / decimal price; their sum is the overround
+  and 1 - 1 / overround the bookmaker's margin (vig)
+- no-vig probabilities divide the implied ones by the overround, over home/away and,
+  for three-way markets, the Draw Odds column
+- Brier score sums (p - outcome)^2 over the market's outcomes and log-loss is
+  -log(p) of the outcome that happened, both from the no-vig probabilities
+- calibration bins every no-vig probability and compares it with how often that
+  outcome happened
+
+Writes data/bookmaker_efficiency.csv (per bookmaker and sport, plus 'All' sports)
+and data/bookmaker_calibration.csv.
+
+Usage:
+    python scripts/analytics.py [--since YYYYMMDD] [--until YYYYMMDD] [--bins 10]
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+import data_loader
+import odds_store
+from file_utils import atomic_write
+from sync import match_results
+
+EFFICIENCY_FILE = 'data/bookmaker_efficiency.csv'
+CALIBRATION_FILE = 'data/bookmaker_calibration.csv'
+CALIBRATION_BINS = 10
+
+# Outcome order used by every (n, 3) array below
+OUTCOMES = ['Home', 'Away', 'Draw']
+
+def read_history_dataset(dataset, start_date=None, end_date=None):
+    # The store is only used once it holds every day the CSVs have; a store that the
+    # nightly sync has only just started writing would otherwise hide the history
+    if odds_store.available():
+        csv_dates = {date_str for date_str, _ in data_loader.dataset_files(dataset, start_date, end_date)}
+        stored = odds_store.stored_dates(dataset, start_date, end_date)
+        if stored and csv_dates <= stored:
+            return data_loader.apply_schema(odds_store.read_dataset(dataset, start_date, end_date), dataset)
+    return data_loader.load_dataset(dataset, start_date, end_date)
+
+def load_history(start_date=None, end_date=None):
+    """Completed games' odds rows with their scores, for an inclusive YYYYMMDD range."""
+    odds_df = read_history_dataset('game_odds', start_date, end_date)
+    results_df = read_history_dataset('game_results', start_date, end_date)
+    if odds_df.empty or results_df.empty:
+        return pd.DataFrame()
+    if 'Draw Odds' not in odds_df.columns:
+        odds_df['Draw Odds'] = np.nan
+
+    positions = match_results(odds_df, results_df, by=['date'])
+    matched = positions >= 0
+    history = odds_df.loc[matched, ['date', 'Sport', 'Bookmaker', 'Home Team Odds', 'Away Team Odds', 'Draw Odds']]
+    results = results_df.iloc[positions[matched]]
+    history = data_loader.exact_prices(history).assign(**{
+        'Home Score': pd.to_numeric(results['Home Score'], errors='coerce').to_numpy(),
+        'Away Score': pd.to_numeric(results['Away Score'], errors='coerce').to_numpy(),
+        'Status': results['Status'].to_numpy()
+    })
+    return history[history['Status'] == 'Completed'].reset_index(drop=True)
+
+def market_probabilities(home_odds, away_odds, draw_odds):
+    """Implied probabilities, overround and no-vig probabilities as (n, 3) / (n,) arrays.
+
+    A two-way market has NaN draw odds; its draw column stays NaN throughout.
+    """
+    odds = np.column_stack([home_odds, away_odds, draw_odds]).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied = np.where(odds > 1, 1 / odds, np.nan)
+    overround = np.nansum(implied, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        no_vig = implied / overround[:, None]
+    return implied, overround, no_vig
+
+def outcome_indices(home_score, away_score):
+    # 0 home win, 1 away win, 2 draw, -1 unknown
+    return np.select([home_score > away_score, away_score > home_score, home_score == away_score], [0, 1, 2], -1)
+
+def score_rows(history):
+    """Per-row margin, Brier, log-loss and favourite columns for load_history's rows."""
+    implied, overround, no_vig = market_probabilities(
+        history['Home Team Odds'], history['Away Team Odds'], history['Draw Odds'])
+    outcome = outcome_indices(history['Home Score'].to_numpy(), history['Away Score'].to_numpy())
+
+    rows = np.arange(len(history))
+    p_outcome = no_vig[rows, np.maximum(outcome, 0)]
+    # A result the market did not offer (a draw on a two-way line) cannot be scored
+    scorable = (outcome >= 0) & ~np.isnan(p_outcome) & (np.sum(~np.isnan(implied), axis=1) >= 2)
+
+    actual = np.zeros_like(no_vig)
+    actual[rows, np.maximum(outcome, 0)] = 1.0
+    brier = np.nansum((no_vig - actual) ** 2, axis=1)
+    log_loss = -np.log(np.clip(p_outcome, 1e-15, 1.0))
+
+    favorite = np.argmax(np.nan_to_num(no_vig, nan=-1.0), axis=1)
+    scored = history.assign(**{
+        'Overround': overround,
+        'Vig': 1 - 1 / overround,
+        'Brier': brier,
+        'Log Loss': log_loss,
+        'Favorite Prob': no_vig[rows, favorite],
+        'Favorite Won': (favorite == outcome).astype(float),
+        'Three Way': ~np.isnan(implied[:, 2])
+    })
+    return scored[scorable].reset_index(drop=True), no_vig[scorable], actual[scorable]
+
+def efficiency_table(scored):
+    metrics = ['Overround', 'Vig', 'Brier', 'Log Loss', 'Favorite Prob', 'Favorite Won']
+    by_sport = scored.groupby(['Bookmaker', 'Sport'], sort=True)[metrics]
+    overall = scored.groupby('Bookmaker', sort=True)[metrics]
+    table = pd.concat([
+        by_sport.mean().join(by_sport.size().rename('Games')),
+        overall.mean().join(overall.size().rename('Games')).assign(Sport='All').set_index('Sport', append=True)
+    ]).reset_index()
+
+    table['Vig %'] = (table.pop('Vig') * 100).round(3)
+    table['Favorite Win %'] = (table.pop('Favorite Won') * 100).round(2)
+    table['Implied Favorite Win %'] = (table.pop('Favorite Prob') * 100).round(2)
+    table = table.round({'Overround': 4, 'Brier': 4, 'Log Loss': 4})
+    columns = ['Bookmaker', 'Sport', 'Games', 'Overround', 'Vig %', 'Brier', 'Log Loss',
+               'Favorite Win %', 'Implied Favorite Win %']
+    return table[columns].sort_values(['Sport', 'Brier'], kind='stable', ignore_index=True)
+
+def calibration_table(scored, no_vig, actual, bins=CALIBRATION_BINS):
+    """Predicted vs observed frequency per bookmaker and probability bin, over every priced outcome."""
+    offered = ~np.isnan(no_vig)
+    predicted = no_vig[offered]
+    bookmakers = np.repeat(scored['Bookmaker'].to_numpy(), offered.sum(axis=1))
+    frame = pd.DataFrame({
+        'Bookmaker': bookmakers,
+        'Bin': np.minimum((predicted * bins).astype(int), bins - 1),
+        'Predicted': predicted,
+        'Observed': actual[offered]
+    })
+    table = frame.groupby(['Bookmaker', 'Bin']).agg(
+        Outcomes=('Observed', 'size'), Predicted=('Predicted', 'mean'), Observed=('Observed', 'mean')
+    ).reset_index()
+    table['Bin'] = [f'{b / bins:.2f}-{(b + 1) / bins:.2f}' for b in table['Bin']]
+    return table.round({'Predicted': 4, 'Observed': 4})
+
+def run(start_date=None, end_date=None, bins=CALIBRATION_BINS):
+    history = load_history(start_date, end_date)
+    if history.empty:
+        print("No completed games with odds found")
+        return None, None
+
+    scored, no_vig, actual = score_rows(history)
+    efficiency = efficiency_table(scored)
+    calibration = calibration_table(scored, no_vig, actual, bins)
+
+    with atomic_write(EFFICIENCY_FILE) as f:
+        efficiency.to_csv(f, index=False)
+    with atomic_write(CALIBRATION_FILE) as f:
+        calibration.to_csv(f, index=False)
+    print(f"Scored {len(scored)} odds rows ({int(scored['Three Way'].sum())} three-way) "
+          f"into {EFFICIENCY_FILE} and {CALIBRATION_FILE}")
+    return efficiency, calibration
+
+def main():
+    parser = argparse.ArgumentParser(description='Bookmaker efficiency analytics')
+    parser.add_argument('--since', help='First date to include (YYYYMMDD)')
+    parser.add_argument('--until', help='Last date to include (YYYYMMDD)')
+    parser.add_argument('--bins', type=int, default=CALIBRATION_BINS, help='Calibration bins')
+    args = parser.parse_args()
+
+    efficiency, _ = run(args.since, args.until, args.bins)
+    if efficiency is not None:
+        print(efficiency[efficiency['Sport'] == 'All'].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Best-price and arbitrage scanner for one odds snapshot.
+
+For every match in a game_odds snapshot the best decimal price per outcome (home,
+away and, in three-way markets, draw) is taken across bookmakers. When the implied
+probabilities of those best prices sum to less than 1 the match is an arbitrage:
+staking each outcome in proportion to 1 / price returns 1 / sum whatever happens.
+Value edges compare each best price with the consensus no-vig probability across all
+books; price * probability - 1 is the expected return of a unit stake.
+
+Usage:
+    python scripts/arbitrage.py data/game_odds_20250301.csv [--min-edge 0.02]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+import data_loader
+from analytics import OUTCOMES, market_probabilities
+
+MATCH_COLUMNS = ['Sport', 'Match Date', 'Home Team', 'Away Team']
+PRICE_COLUMNS = ['Home Team Odds', 'Away Team Odds', 'Draw Odds']
+
+def price_arrays(odds_df):
+    """Matches plus (n_matches, 3) arrays of best price, best bookmaker and consensus no-vig probability."""
+    if 'Draw Odds' not in odds_df.columns:
+        odds_df = odds_df.assign(**{'Draw Odds': np.nan})
+
+    codes = odds_df.groupby(MATCH_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+    n_matches = codes.max() + 1 if len(codes) else 0
+    firsts = np.unique(codes, return_index=True)[1]
+    matches = odds_df[MATCH_COLUMNS].iloc[firsts].reset_index(drop=True)
+    prices = odds_df[PRICE_COLUMNS].to_numpy(dtype=float)
+    bookmakers = odds_df['Bookmaker'].to_numpy()
+    _, _, no_vig = market_probabilities(prices[:, 0], prices[:, 1], prices[:, 2])
+
+    best_odds = np.full((n_matches, 3), np.nan)
+    best_books = np.full((n_matches, 3), None, dtype=object)
+    consensus = np.full((n_matches, 3), np.nan)
+    for i in range(3):
+        price = prices[:, i]
+        priced = ~np.isnan(price)
+        # Highest price first within each match; the first priced row per match is the best one
+        order = np.lexsort((-price, codes))
+        order = order[priced[order]]
+        first = order[np.r_[True, codes[order][1:] != codes[order][:-1]]] if len(order) else order
+        best_odds[codes[first], i] = price[first]
+        best_books[codes[first], i] = bookmakers[first]
+
+        probability_sum = np.bincount(codes[priced], weights=no_vig[priced, i], minlength=n_matches)
+        quotes = np.bincount(codes[priced], minlength=n_matches)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            consensus[:, i] = probability_sum / quotes
+    books = np.bincount(codes, minlength=n_matches)
+    return matches, books, best_odds, best_books, consensus
+
+def best_columns(books, best_odds, best_books, consensus):
+    columns = {'Books': books}
+    for i, outcome in enumerate(OUTCOMES):
+        columns[f'Best {outcome} Odds'] = best_odds[:, i]
+        columns[f'Best {outcome} Bookmaker'] = best_books[:, i]
+        columns[f'Consensus {outcome} Prob'] = consensus[:, i]
+    return columns
+
+def best_prices(odds_df):
+    """One row per match with the best price, its bookmaker and the consensus no-vig probability per outcome."""
+    matches, books, best_odds, best_books, consensus = price_arrays(odds_df)
+    return pd.concat([matches, pd.DataFrame(best_columns(books, best_odds, best_books, consensus))], axis=1)
+
+def scan(odds_df, min_edge=0.0):
+    """Best prices per match plus 'Implied Sum', 'Arbitrage %', stakes and value edges."""
+    matches, books, best_odds, best_books, consensus = price_arrays(odds_df)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied = 1 / best_odds
+        implied_sum = np.nansum(implied, axis=1)
+        stakes = implied / implied_sum[:, None] * 100
+        arbitrage_pct = np.where(implied_sum < 1, (1 / implied_sum - 1) * 100, 0.0)
+    edges = best_odds * consensus - 1
+    max_edge = np.max(np.where(np.isnan(edges), -np.inf, edges), axis=1)
+
+    columns = best_columns(books, best_odds, best_books, consensus)
+    # A match is three-way when any book prices the draw
+    columns['Three Way'] = ~np.isnan(best_odds[:, 2])
+    columns['Implied Sum'] = implied_sum.round(4)
+    columns['Arbitrage %'] = arbitrage_pct.round(3)
+    for i, outcome in enumerate(OUTCOMES):
+        columns[f'{outcome} Stake %'] = stakes[:, i].round(2)
+        columns[f'{outcome} Edge'] = edges[:, i].round(4)
+    columns['Max Edge'] = max_edge
+    columns['Arbitrage'] = implied_sum < 1
+    columns['Value'] = max_edge > min_edge
+    return pd.concat([matches, pd.DataFrame(columns)], axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Find best prices, arbitrage and value edges in an odds snapshot')
+    parser.add_argument('odds_file', help='A data/game_odds_YYYYMMDD.csv snapshot')
+    parser.add_argument('--min-edge', type=float, default=0.02, help='Minimum expected return to report a value edge')
+    args = parser.parse_args()
+
+    odds_df = data_loader.exact_prices(data_loader.read_file(args.odds_file, 'game_odds'))
+    start = time.perf_counter()
+    report = scan(odds_df, args.min_edge)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Scanned {len(report)} matches from {len(odds_df)} prices in {elapsed:.1f}ms: "
+          f"{int(report['Arbitrage'].sum())} arbitrage, {int(report['Value'].sum())} value edges above {args.min_edge:.0%}")
+
+    arbitrage = report[report['Arbitrage']].sort_values('Arbitrage %', ascending=False)
+    if not arbitrage.empty:
+        columns = ['Sport', 'Home Team', 'Away Team', 'Arbitrage %'] + [
+            f'Best {outcome} {field}' for outcome in OUTCOMES for field in ('Odds', 'Bookmaker')]
+        print(arbitrage[columns].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
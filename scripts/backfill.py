@@ -0,0 +1,131 @@
+"""Recompute results and sportsbook performance for a whole date range in parallel.
+
+Usage:
+    python scripts/backfill.py --start 20250101 --end 20250630 [--workers 4] [--force]
+
+The same as `python scripts/odds.py backfill`, which defines the options.
+
+Each date is handled by a worker process: read the odds file, load the results
+file (or build it from the scores API / response cache when missing), merge
+and compute the bookmaker stats. Outputs are written atomically. Each rebuilt
+date's odds and results content hash is kept in data/performance_inputs.json, and
+dates whose inputs still hash the same are skipped unless --force is given. The
+Parquet store and leaderboard are then updated once, in order.
+"""
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import pandas as pd
+
+import leaderboard
+from file_utils import atomic_write
+import odds_store
+import run_report
+from results import process_results, scores_days_from
+from scores_client import has_cache
+from sports import SPORT_KEY_MAP
+from sync import build_performance, write_performance
+
+INPUT_HASHES_FILE = os.path.join('data', 'performance_inputs.json')
+
+def date_range(start, end):
+    day = datetime.strptime(start, '%Y%m%d')
+    last = datetime.strptime(end, '%Y%m%d')
+    while day <= last:
+        yield day.strftime('%Y%m%d')
+        day += timedelta(days=1)
+
+def inputs_hash(input_files):
+    """Content hash of input_files, in order; checkouts and copies leave it unchanged."""
+    digest = hashlib.sha256()
+    for path in input_files:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+def load_input_hashes(path=INPUT_HASHES_FILE):
+    """{date_str: inputs_hash} recorded for each performance file backfill last built."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_input_hashes(hashes, path=INPUT_HASHES_FILE):
+    with atomic_write(path, encoding='utf-8') as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+
+def is_up_to_date(output_file, input_files, recorded_hash):
+    return os.path.exists(output_file) and recorded_hash == inputs_hash(input_files)
+
+def scores_available(odds_file, date_str):
+    # Outside the API's window only the response cache can serve scores, and a cache
+    # holding some of the day's sports would rebuild the results from just those
+    if scores_days_from(date_str) is not None:
+        return True
+    sports = pd.read_csv(odds_file, usecols=['Sport'])['Sport'].unique()
+    return all(has_cache(SPORT_KEY_MAP[sport], date_str) for sport in sports if sport in SPORT_KEY_MAP)
+
+def backfill_date(date_str, force=False, recorded_hash=None):
+    """Rebuild one date; returns (date_str, status, merged_df or None, inputs hash or None)."""
+    odds_file = f'data/game_odds_{date_str}.csv'
+    results_file = f'data/game_results_{date_str}.csv'
+    output_file = f'data/sportsbook_performance_{date_str}.csv'
+
+    if not os.path.exists(odds_file):
+        return date_str, 'no odds', None, None
+
+    # Scores come from the API inside its window and from the response cache before it;
+    # --force only refetches an existing results file when every sport can be served
+    if not os.path.exists(results_file) or (force and scores_available(odds_file, date_str)):
+        process_results(date_str, update_store=False)
+    if not os.path.exists(results_file):
+        return date_str, 'no results', None, None
+
+    input_files = [odds_file, results_file]
+    if not force and is_up_to_date(output_file, input_files, recorded_hash):
+        return date_str, 'up to date', None, recorded_hash
+
+    odds_df = pd.read_csv(odds_file)
+    results_df = pd.read_csv(results_file)
+    stats_df, merged_df = build_performance(odds_df, results_df)
+    write_performance(output_file, stats_df, merged_df)
+    return date_str, 'rebuilt', merged_df, inputs_hash(input_files)
+
+def backfill(start, end, workers=None, force=False):
+    dates = list(date_range(start, end))
+    rebuilt = {}
+    hashes = load_input_hashes()
+
+    with run_report.stage('dates'), ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(backfill_date, date_str, force, hashes.get(date_str)) for date_str in dates]
+        for future in as_completed(futures):
+            date_str, status, merged_df, digest = future.result()
+            print(f"{date_str}: {status}")
+            run_report.count(f'dates {status}')
+            if merged_df is not None:
+                rebuilt[date_str] = merged_df
+                hashes[date_str] = digest
+
+    # Shared files are only touched from this process, in date order
+    with run_report.stage('store'):
+        for date_str in sorted(rebuilt):
+            odds_store.write_partition(pd.read_csv(f'data/game_results_{date_str}.csv'), 'game_results', date_str)
+            odds_store.write_partition(rebuilt[date_str], 'sportsbook_performance', date_str)
+    if rebuilt:
+        with run_report.stage('leaderboard'):
+            leaderboard.update_leaderboard_days(rebuilt)
+        save_input_hashes(hashes)
+
+    print(f"Rebuilt {len(rebuilt)} of {len(dates)} dates between {start} and {end}")
+    return rebuilt
+
+def main():
+    """Same as `python scripts/odds.py backfill ...`; the options are defined there."""
+    from odds import main as odds_main
+    odds_main(['backfill'] + sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Typed loader for the per-day game_odds, game_results and sportsbook_performance CSVs.
+
+Column types come from odds_store.SCHEMAS, mapped to in-memory dtypes: names and
+statuses become categoricals, odds and scores float32 and times datetime64. With
+pyarrow installed each day is parsed straight into typed Arrow columns and all days
+are converted to pandas once, so a multi-month frame shares one sorted category list
+per column (teams and bookmakers are stored once and group in name order). Without
+pyarrow the days are read with the C engine and typed after concatenating.
+
+Values are rounded to float32, so use this for analysis; pipeline stages that
+write CSVs back keep reading them as plain float64. exact_prices() gives back the
+float64 decimal odds, which the CSVs hold to 3 decimals.
+
+Usage:
+    python scripts/data_loader.py game_odds [--since YYYYMMDD] [--until YYYYMMDD]
+"""
+import argparse
+import glob
+import io
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+from odds_store import SCHEMAS, parse_dates, performance_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# IDs are unique per game, so a category list would not save anything
+TEXT_COLUMNS = {'Game ID', 'Event ID'}
+PRICE_COLUMNS = ['Home Team Odds', 'Away Team Odds', 'Draw Odds']
+
+def column_dtypes(dataset):
+    """Column -> in-memory dtype ('category', 'float32', 'str', 'datetime' or 'date')."""
+    dtypes = {}
+    for name, kind in SCHEMAS[dataset].items():
+        if kind == 'string':
+            dtypes[name] = 'str' if name in TEXT_COLUMNS else 'category'
+        elif kind == 'float64':
+            dtypes[name] = 'float32'
+        elif kind == 'timestamp':
+            dtypes[name] = 'datetime'
+        else:
+            dtypes[name] = 'date'
+    return dtypes
+
+def arrow_types(dataset):
+    # Times stay text here: early files mix formats that pandas parses more leniently
+    types = {'category': pa.dictionary(pa.int32(), pa.string()), 'float32': pa.float32()}
+    return {name: types.get(dtype, pa.string()) for name, dtype in column_dtypes(dataset).items()}
+
+def apply_schema(df, dataset):
+    """df with the dataset's columns cast to their in-memory dtypes; other columns are left alone."""
+    columns = {}
+    for name, dtype in column_dtypes(dataset).items():
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if dtype == 'datetime':
+            if not pd.api.types.is_datetime64_any_dtype(column):
+                column = pd.to_datetime(column, errors='coerce', format='mixed')
+        elif dtype == 'date':
+            column = parse_dates(column)
+        elif dtype == 'float32':
+            column = pd.to_numeric(column, errors='coerce').astype('float32')
+        elif dtype == 'category':
+            if column.dtype != 'category':
+                column = column.astype('str').astype('category')
+            # Sorted categories keep sort_values/groupby in name order, as with plain strings
+            column = column.cat.set_categories(sorted(column.cat.categories.astype('str')))
+        else:
+            column = column.astype(dtype)
+        columns[name] = column
+    return df.assign(**columns)
+
+def exact_prices(df):
+    """df with its float32 decimal odds back as the float64 values saved to 3 decimals."""
+    columns = [name for name in PRICE_COLUMNS if name in df.columns]
+    return df.assign(**{name: df[name].astype('float64').round(3) for name in columns})
+
+def read_source(path, dataset):
+    """path, or the rows part of a sportsbook_performance file; None when it has no rows."""
+    if dataset != 'sportsbook_performance':
+        return path
+    with open(path, 'rb') as f:
+        rows = performance_rows(f.read())
+    return io.BytesIO(rows) if rows is not None else None
+
+def read_raw(path, dataset):
+    """One day's rows, typed by Arrow when it is installed (a pyarrow Table) or untyped (a DataFrame)."""
+    source = read_source(path, dataset)
+    if source is None:
+        return None
+    if pa is None:
+        return pd.read_csv(source)
+    options = pa_csv.ConvertOptions(column_types=arrow_types(dataset), strings_can_be_null=True)
+    return pa_csv.read_csv(source, convert_options=options)
+
+def to_frame(parts, dataset):
+    if not parts:
+        return pd.DataFrame()
+    if pa is None:
+        df = pd.concat(parts, ignore_index=True)
+    else:
+        df = pa.concat_tables(parts, promote_options='permissive').to_pandas()
+    return apply_schema(df, dataset)
+
+def read_file(path, dataset):
+    """One day's file as a typed frame."""
+    raw = read_raw(path, dataset)
+    return to_frame([raw] if raw is not None else [], dataset)
+
+def dataset_files(dataset, start_date=None, end_date=None, data_dir='data'):
+    """[(YYYYMMDD, path)] of a dataset's files in the inclusive date range."""
+    files = []
+    for path in sorted(glob.glob(os.path.join(data_dir, f'{dataset}_*.csv'))):
+        match = re.search(r'_(\d{8})\.csv$', path)
+        if not match:
+            continue
+        date_str = match.group(1)
+        if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+            continue
+        files.append((date_str, path))
+    return files
+
+def load_dataset(dataset, start_date=None, end_date=None, data_dir='data'):
+    """Every day of a dataset in [start_date, end_date] as one typed frame with a categorical 'date' column."""
+    dates, parts = [], []
+    for date_str, path in dataset_files(dataset, start_date, end_date, data_dir):
+        raw = read_raw(path, dataset)
+        if raw is not None and len(raw):
+            dates.append(date_str)
+            parts.append(raw)
+    df = to_frame(parts, dataset)
+    if parts:
+        codes = np.repeat(np.arange(len(dates), dtype='int32'), [len(part) for part in parts])
+        df['date'] = pd.Categorical.from_codes(codes, categories=dates)
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description='Load a dataset with typed columns and report its size')
+    parser.add_argument('dataset', choices=list(SCHEMAS))
+    parser.add_argument('--since', help='First date to include (YYYYMMDD)')
+    parser.add_argument('--until', help='Last date to include (YYYYMMDD)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = load_dataset(args.dataset, args.since, args.until)
+    elapsed = time.perf_counter() - start
+    engine = 'pyarrow' if pa is not None else 'C'
+    print(f"Loaded {len(df)} {args.dataset} rows with the {engine} CSV reader in {elapsed:.2f}s, "
+          f"{df.memory_usage(deep=True).sum() / 1e6:.1f}MB in memory")
+    print(df.dtypes.to_string())
+
+if __name__ == "__main__":
+    main()
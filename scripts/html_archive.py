@@ -0,0 +1,76 @@
+"""Content-addressed archive of the raw comparer pages save_odds.py downloads.
+
+Every page is gzip-compressed once under data/archive/html/objects/<sha[:2]>/<sha>.html.gz,
+so a page that did not change between runs costs nothing extra. data/archive/html/index.csv
+records one row per fetch (target date, sport, url, fetch time, content hash), which is
+what save_odds.py --from-archive uses to re-parse past days without the network.
+"""
+import csv
+import gzip
+import hashlib
+import os
+import pandas as pd
+
+from file_utils import atomic_write
+
+ARCHIVE_DIR = os.getenv('ODDS_ARCHIVE_DIR', os.path.join('data', 'archive', 'html'))
+INDEX_COLUMNS = ['date', 'sport', 'url', 'fetched_at', 'sha256', 'bytes']
+
+def index_path():
+    return os.path.join(ARCHIVE_DIR, 'index.csv')
+
+def object_path(sha256):
+    return os.path.join(ARCHIVE_DIR, 'objects', sha256[:2], f'{sha256}.html.gz')
+
+def content_hash(html_content):
+    return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+def has_object(sha256):
+    return bool(sha256) and os.path.exists(object_path(sha256))
+
+def save_object(html_content):
+    """Store a page body once under its content hash; returns the hash."""
+    data = html_content.encode('utf-8')
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    path = object_path(sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # mtime=0 keeps the compressed bytes identical for identical pages
+        with atomic_write(path, 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    return sha256
+
+def save_snapshot(sport, url, html_content, date_str, fetched_at):
+    """Store one downloaded page for target date date_str; returns its content hash."""
+    sha256 = save_object(html_content)
+    data_bytes = len(html_content.encode('utf-8'))
+
+    new_index = not os.path.exists(index_path())
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(index_path(), 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new_index:
+            writer.writerow(INDEX_COLUMNS)
+        writer.writerow([date_str, sport, url, fetched_at, sha256, data_bytes])
+    return sha256
+
+def load_snapshot(sha256):
+    with open(object_path(sha256), 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8')
+
+def load_index():
+    if not os.path.exists(index_path()):
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    return pd.read_csv(index_path(), dtype={'date': str})
+
+def snapshots_for_date(date_str, index=None):
+    """Latest archived fetch of each sport for target date date_str."""
+    index = load_index() if index is None else index
+    day = index[index['date'] == date_str]
+    return day.sort_values('fetched_at', kind='stable').drop_duplicates('sport', keep='last')
+
+def archived_dates(start_date=None, end_date=None, index=None):
+    index = load_index() if index is None else index
+    dates = sorted(index['date'].unique())
+    return [d for d in dates if (not start_date or d >= start_date) and (not end_date or d <= end_date)]
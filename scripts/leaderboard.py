@@ -0,0 +1,150 @@
+"""Cumulative bookmaker leaderboard built from per-day, per-sport aggregates.
+
+data/bookmaker_leaderboard.csv holds one row per (date, Bookmaker, Sport) with
+summable counters, so each nightly sync only aggregates that day's merged rows
+and any season-to-date, last-N-days or by-sport view is a small groupby.
+
+Win rates over fewer than --min-games completed games (MIN_COMPLETED_GAMES by
+default) say little, so those bookmakers are left off the board.
+
+Usage:
+    python scripts/leaderboard.py [--days 7] [--since YYYYMMDD] [--by-sport] [--min-games 10]
+    python scripts/leaderboard.py rebuild    # recompute from data/sportsbook_performance_*.csv
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+from file_utils import atomic_write
+
+LEADERBOARD_FILE = 'data/bookmaker_leaderboard.csv'
+# Fewest completed games a bookmaker (or bookmaker and sport) needs to be ranked
+MIN_COMPLETED_GAMES = int(os.getenv('LEADERBOARD_MIN_GAMES', '10'))
+
+COUNTER_COLUMNS = [
+    'Games', 'Completed Games', 'Unknown Games', 'Favorite Wins',
+    'Underdog Wins', 'Favorite Implied Prob'
+]
+
+def daily_aggregates(merged_df, date_str):
+    """Per (Bookmaker, Sport) counters for one day of sync_data's merged odds/results rows."""
+    if merged_df.empty:
+        return pd.DataFrame(columns=['date', 'Bookmaker', 'Sport'] + COUNTER_COLUMNS)
+
+    home_odds = pd.to_numeric(merged_df['Home Team Odds'], errors='coerce').to_numpy()
+    away_odds = pd.to_numeric(merged_df['Away Team Odds'], errors='coerce').to_numpy()
+    home_score = pd.to_numeric(merged_df['Home Score'], errors='coerce').to_numpy()
+    away_score = pd.to_numeric(merged_df['Away Score'], errors='coerce').to_numpy()
+    status = merged_df['Status'].to_numpy()
+
+    # Same favourite/winner rules as sync_data: a draw counts against the favourite
+    home_favorite = home_odds < away_odds
+    completed = status == 'Completed'
+    favorite_won = completed & np.where(home_favorite, home_score > away_score, away_score > home_score)
+
+    counters = pd.DataFrame({
+        'Bookmaker': merged_df['Bookmaker'].to_numpy(),
+        'Sport': merged_df['Sport'].to_numpy(),
+        'Games': 1,
+        'Completed Games': completed.astype(int),
+        'Unknown Games': (status == 'Unknown').astype(int),
+        'Favorite Wins': favorite_won.astype(int),
+        'Underdog Wins': (completed & ~favorite_won).astype(int),
+        'Favorite Implied Prob': np.where(completed, 1 / np.minimum(home_odds, away_odds), 0.0)
+    })
+
+    daily = counters.groupby(['Bookmaker', 'Sport'], as_index=False, sort=False).sum()
+    daily.insert(0, 'date', date_str)
+    return daily
+
+def load_leaderboard(path=LEADERBOARD_FILE):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['date', 'Bookmaker', 'Sport'] + COUNTER_COLUMNS)
+    return pd.read_csv(path, dtype={'date': str})
+
+def update_leaderboard(merged_df, date_str, path=LEADERBOARD_FILE):
+    """Replace date_str's counters with those from merged_df; re-running a day is idempotent."""
+    return update_leaderboard_days({date_str: merged_df}, path)
+
+def update_leaderboard_days(merged_by_date, path=LEADERBOARD_FILE):
+    """Replace the counters for every {date_str: merged_df} given, rewriting the table once."""
+    daily = [daily_aggregates(merged_df, date_str) for date_str, merged_df in merged_by_date.items()]
+    history = load_leaderboard(path)
+    history = history[~history['date'].isin(list(merged_by_date))]
+    frames = [frame for frame in [history] + daily if not frame.empty]
+    updated = pd.concat(frames, ignore_index=True) if frames else history
+    updated = updated.sort_values(['date', 'Bookmaker', 'Sport'], kind='stable')
+    with atomic_write(path) as f:
+        updated.to_csv(f, index=False)
+    print(f"Leaderboard updated with {sum(len(frame) for frame in daily)} bookmaker/sport rows "
+          f"for {len(daily)} day(s)")
+    return updated
+
+def leaderboard(since=None, until=None, last_days=None, by_sport=False, sports=None, path=LEADERBOARD_FILE,
+                min_games=MIN_COMPLETED_GAMES):
+    """Win rates per bookmaker (and sport) with at least min_games completed games over an inclusive YYYYMMDD window."""
+    history = load_leaderboard(path)
+    if last_days:
+        until = until or history['date'].max()
+        start = datetime.strptime(until, '%Y%m%d') - timedelta(days=last_days - 1)
+        since = start.strftime('%Y%m%d')
+    if since:
+        history = history[history['date'] >= since]
+    if until:
+        history = history[history['date'] <= until]
+    if sports:
+        history = history[history['Sport'].isin(sports)]
+
+    keys = ['Bookmaker', 'Sport'] if by_sport else ['Bookmaker']
+    board = history.groupby(keys, as_index=False)[COUNTER_COLUMNS].sum()
+    board = board[board['Completed Games'] >= min_games]
+
+    completed = board['Completed Games'].replace(0, np.nan)
+    board['Favorite Win %'] = (board['Favorite Wins'] / completed * 100).round(2)
+    board['Underdog Win %'] = (board['Underdog Wins'] / completed * 100).round(2)
+    board['Implied Favorite Win %'] = (board['Favorite Implied Prob'] / completed * 100).round(2)
+    board = board.drop(columns='Favorite Implied Prob')
+    return board.sort_values(keys[1:] + ['Favorite Win %'], ascending=[True] * (len(keys) - 1) + [False])
+
+def rebuild(data_dir='data', path=LEADERBOARD_FILE):
+    import data_loader
+    from sports import canonical_sport_names
+
+    merged = data_loader.load_dataset('sportsbook_performance', data_dir=data_dir)
+    frames = []
+    if not merged.empty:
+        merged = data_loader.exact_prices(merged.dropna(subset=['Home Team Odds', 'Away Team Odds']))
+        # Early files spell sports in lowercase ('nba'); count them under the registry name
+        names = canonical_sport_names(os.path.join(data_dir, 'sports_url.csv'))
+        merged['Sport'] = merged['Sport'].astype(str).map(lambda sport: names.get(sport.lower(), sport))
+        frames = [daily_aggregates(merged_df, date_str) for date_str, merged_df in merged.groupby('date', observed=True)]
+
+    rebuilt = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['date', 'Bookmaker', 'Sport'] + COUNTER_COLUMNS)
+    rebuilt = rebuilt.sort_values(['date', 'Bookmaker', 'Sport'], kind='stable')
+    with atomic_write(path) as f:
+        rebuilt.to_csv(f, index=False)
+    print(f"Rebuilt leaderboard from {len(frames)} days into {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Cumulative bookmaker leaderboard')
+    parser.add_argument('command', nargs='?', choices=['show', 'rebuild'], default='show')
+    parser.add_argument('--days', type=int, help='Only the last N days up to the latest date')
+    parser.add_argument('--since', help='First date to include (YYYYMMDD)')
+    parser.add_argument('--until', help='Last date to include (YYYYMMDD)')
+    parser.add_argument('--by-sport', action='store_true', help='Break the leaderboard down by sport')
+    parser.add_argument('--sport', action='append', dest='sports', help='Limit to a sport (repeatable)')
+    parser.add_argument('--min-games', type=int, default=MIN_COMPLETED_GAMES,
+                        help='Fewest completed games to be ranked (default: %(default)s)')
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        rebuild()
+        return
+
+    board = leaderboard(args.since, args.until, args.days, args.by_sport, args.sports, min_games=args.min_games)
+    print(board.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
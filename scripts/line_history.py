@@ -0,0 +1,128 @@
+"""Intraday line history stored as price changes only.
+
+data/lines/lines_YYYYMMDD.csv holds, for the games on that date, one row per
+(match, bookmaker, outcome) price each time it changes between polls, stamped with
+the poll's Compiled_At. A line that disappears from a poll gets a row with an empty
+Price. Any earlier board is rebuilt by taking the last row per key up to that time.
+
+Usage:
+    python scripts/line_history.py as-of 20250301 "2025-03-01 18:00:00"
+    python scripts/line_history.py movement 20250301
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+LINES_DIR = os.path.join('data', 'lines')
+
+MATCH_COLUMNS = ['Sport', 'Match Date', 'Home Team', 'Away Team', 'Bookmaker']
+KEY_COLUMNS = MATCH_COLUMNS + ['Outcome']
+LINE_COLUMNS = KEY_COLUMNS + ['Price', 'Compiled_At']
+
+# Outcome name -> game_odds price column
+OUTCOME_COLUMNS = {
+    'Home': 'Home Team Odds',
+    'Away': 'Away Team Odds',
+    'Draw': 'Draw Odds'
+}
+
+def lines_file(date_str):
+    return os.path.join(LINES_DIR, f'lines_{date_str}.csv')
+
+def to_lines(odds_df):
+    """Melt game_odds rows into one (match, bookmaker, outcome) price per row."""
+    value_columns = [column for column in OUTCOME_COLUMNS.values() if column in odds_df.columns]
+    lines = odds_df.melt(id_vars=MATCH_COLUMNS + ['Compiled_At'], value_vars=value_columns,
+                         var_name='Outcome', value_name='Price')
+    lines['Outcome'] = lines['Outcome'].map({column: name for name, column in OUTCOME_COLUMNS.items()})
+    lines = lines.dropna(subset=['Price'])
+    lines['Match Date'] = pd.to_datetime(lines['Match Date']).dt.strftime('%Y-%m-%d %H:%M:%S')
+    return lines[LINE_COLUMNS]
+
+def load_lines(date_str):
+    path = lines_file(date_str)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=LINE_COLUMNS)
+    return pd.read_csv(path)
+
+def latest_prices(lines, as_of=None):
+    # Last known row per key at or before as_of; pulled lines (empty Price) drop out
+    if as_of is not None:
+        lines = lines[lines['Compiled_At'] <= as_of]
+    lines = lines.sort_values('Compiled_At', kind='stable').drop_duplicates(KEY_COLUMNS, keep='last')
+    return lines.dropna(subset=['Price'])
+
+def record_snapshot(odds_df, date_str):
+    """Append the prices in odds_df (one poll for date_str's games) that changed since the last poll."""
+    current = to_lines(odds_df)
+    compiled_at = odds_df['Compiled_At'].iloc[0]
+    previous = latest_prices(load_lines(date_str))
+
+    merged = current.merge(previous[KEY_COLUMNS + ['Price']], on=KEY_COLUMNS, how='outer',
+                           suffixes=('', '_previous'), indicator=True)
+    changed = merged[(merged['_merge'] == 'left_only') |
+                     ((merged['_merge'] == 'both') & ~np.isclose(merged['Price'].astype(float), merged['Price_previous'].astype(float)))]
+    # Only sports present in this poll can have pulled lines; a failed download is not a pull
+    pulled = merged[(merged['_merge'] == 'right_only') & merged['Sport'].isin(current['Sport'])]
+    pulled = pulled.assign(Price=np.nan, Compiled_At=compiled_at)
+    deltas = pd.concat([changed, pulled], ignore_index=True)[LINE_COLUMNS]
+
+    path = lines_file(date_str)
+    os.makedirs(LINES_DIR, exist_ok=True)
+    if len(deltas):
+        deltas.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+    print(f"Recorded {len(deltas)} changed lines out of {len(current)} for {date_str} at {compiled_at}")
+    return deltas
+
+def odds_as_of(date_str, as_of=None):
+    """The board for date_str's games as it stood at as_of ('YYYY-MM-DD HH:MM:SS'), in game_odds layout."""
+    prices = latest_prices(load_lines(date_str), as_of)
+    columns = ['Sport', 'Match Date', 'Home Team', 'Away Team', 'Home Team Odds', 'Away Team Odds', 'Bookmaker']
+    if prices.empty:
+        return pd.DataFrame(columns=columns + ['Compiled_At'])
+
+    board = prices.pivot(index=MATCH_COLUMNS, columns='Outcome', values='Price')
+    board = board.join(prices.groupby(MATCH_COLUMNS)['Compiled_At'].max())
+    board = board.rename(columns=OUTCOME_COLUMNS).reset_index()
+    for column in ('Home Team Odds', 'Away Team Odds'):
+        if column not in board.columns:
+            board[column] = np.nan
+    extra = ['Draw Odds'] if 'Draw Odds' in board.columns else []
+    board = board.dropna(subset=['Home Team Odds', 'Away Team Odds'])
+    return board[columns + extra + ['Compiled_At']].reset_index(drop=True)
+
+def line_movement(date_str):
+    """Opening and closing price per (match, bookmaker, outcome); closing is the last price before start."""
+    lines = load_lines(date_str).sort_values('Compiled_At', kind='stable')
+    lines = lines[lines['Compiled_At'] <= lines['Match Date']].dropna(subset=['Price'])
+    grouped = lines.groupby(KEY_COLUMNS, sort=False)
+
+    movement = grouped.first()[['Price', 'Compiled_At']].rename(
+        columns={'Price': 'Opening Price', 'Compiled_At': 'Opened At'})
+    closing = grouped.last()[['Price', 'Compiled_At']].rename(
+        columns={'Price': 'Closing Price', 'Compiled_At': 'Closed At'})
+    movement = movement.join(closing).reset_index()
+    movement['Movement'] = (movement['Closing Price'] - movement['Opening Price']).round(3)
+    # Implied probability shift: positive means the market moved towards this outcome
+    movement['Implied Prob Change'] = (1 / movement['Closing Price'] - 1 / movement['Opening Price']).round(4)
+    movement['Changes'] = grouped.size().to_numpy() - 1
+    return movement
+
+def main():
+    parser = argparse.ArgumentParser(description='Query intraday line history')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    as_of_parser = subparsers.add_parser('as-of', help="Rebuild a date's board at a point in time")
+    as_of_parser.add_argument('date', help='Game date (YYYYMMDD)')
+    as_of_parser.add_argument('timestamp', nargs='?', help='YYYY-MM-DD HH:MM:SS (EST), defaults to the latest poll')
+    movement_parser = subparsers.add_parser('movement', help='Opening vs closing line per outcome')
+    movement_parser.add_argument('date', help='Game date (YYYYMMDD)')
+    args = parser.parse_args()
+
+    if args.command == 'as-of':
+        print(odds_as_of(args.date, args.timestamp).to_string(index=False))
+    else:
+        print(line_movement(args.date).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Local stand-in for the odds comparer site and the-odds-api, for offline runs and load tests.
+
+Serves
+    GET /odds/<sport key>/moneyline            comparer page
+    GET /v4/sports/<sport key>/scores/         scores payload
+    GET /v4/sports/<sport key>/events/         the same games without scores
+    GET /stats                                 request and fault counts so far
+
+from --fixtures DIR (pages/<sport key>.html and scores/<sport key>.json, as
+benchmarks/synthetic.py writes them), falling back to the HTML archive and the scores
+cache under data/ for --date. Point the pipeline at it with
+
+    ODDS_COMPARER_URL=http://127.0.0.1:8765 ODDS_API_URL=http://127.0.0.1:8765/v4 \\
+        python scripts/odds.py fetch --date 20250315
+
+Faults are drawn per request from --seed, the path and how many times that path was
+requested before, so a run plays out the same way whatever the concurrency:
+--latency/--jitter delay every response, --rate-limit answers 429 with Retry-After,
+--timeout holds the response for --hang seconds (HANG_SECONDS by default, well past
+the clients' timeouts) and --partial cuts a page off partway through.
+
+Usage:
+    python scripts/mock_server.py [--port 8765] [--fixtures DIR] [--date YYYYMMDD]
+        [--latency 50] [--jitter 50] [--rate-limit 0.1] [--timeout 0.02] [--partial 0.05] [--seed 0]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import html_archive
+import scores_client
+
+PAGE_PATH = re.compile(r'^/odds/([\w-]+)/moneyline/?$')
+API_PATH = re.compile(r'^/v4/sports/([\w-]+)/(scores|events)/?$')
+QUOTA = 500
+# Longer than the pipeline's default timeouts (30s for pages, 15s for the API), so a
+# held request always times out on the client
+HANG_SECONDS = 90.0
+
+class MockState:
+    """Fixtures and fault settings shared by every request thread."""
+
+    def __init__(self, fixtures_dir=None, date_str=None, latency=0.0, jitter=0.0, rate_limit=0.0,
+                 timeout=0.0, partial=0.0, hang=HANG_SECONDS, retry_after=1, seed=0):
+        self.fixtures_dir = fixtures_dir
+        self.date_str = date_str
+        self.latency, self.jitter, self.hang, self.retry_after = latency, jitter, hang, retry_after
+        self.rate_limit, self.timeout, self.partial = rate_limit, timeout, partial
+        self.seed = seed
+        self.archived = self.archived_pages()
+        self.attempts = Counter()
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    def archived_pages(self):
+        # url -> content hash of the latest archived fetch (for --date, or of any date)
+        index = html_archive.load_index()
+        if self.date_str:
+            index = index[index['date'] == self.date_str]
+        latest = index.sort_values('fetched_at', kind='stable').drop_duplicates('url', keep='last')
+        return dict(zip(latest['url'], latest['sha256']))
+
+    def fixture(self, kind, name):
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, kind, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def page(self, sport_key):
+        html = self.fixture('pages', f'{sport_key}.html')
+        if html is None:
+            sha256 = self.archived.get(f'/odds/{sport_key}/moneyline')
+            if html_archive.has_object(sha256):
+                html = html_archive.load_snapshot(sha256)
+        return html
+
+    def scores(self, sport_key):
+        payload = self.fixture('scores', f'{sport_key}.json')
+        if payload is not None:
+            return json.loads(payload)
+        if self.date_str:
+            # read_cache falls back to every daysFrom window the day may have been fetched with
+            return scores_client.read_cache(sport_key, 1, self.date_str, cache_only=True)
+        return None
+
+    def draw_fault(self, path):
+        """(delay seconds, fault or None, rng) for this request, the same for the same path and attempt."""
+        with self.lock:
+            attempt = self.attempts[path]
+            self.attempts[path] += 1
+            self.stats['requests'] += 1
+        rng = random.Random(f'{self.seed}:{path}:{attempt}')
+        delay = (self.latency + rng.uniform(0, self.jitter)) / 1000
+        roll = rng.random()
+        fault = None
+        for name, rate in (('rate limited', self.rate_limit), ('timed out', self.timeout), ('partial', self.partial)):
+            if roll < rate:
+                fault = name
+                break
+            roll -= rate
+        return delay, fault, rng
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type, headers=None):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self.path.split('?', 1)[0]
+        if path == '/stats':
+            with state.lock:
+                stats = dict(state.stats)
+            self.send_body(200, json.dumps(stats), 'application/json')
+            return
+
+        delay, fault, rng = state.draw_fault(path)
+        if fault == 'timed out':
+            state.count(fault)
+            delay = max(delay, state.hang)
+        if delay:
+            time.sleep(delay)
+        try:
+            if fault == 'rate limited':
+                state.count(fault)
+                self.send_body(429, json.dumps({'message': 'Too many requests'}), 'application/json',
+                               {'Retry-After': str(state.retry_after)})
+            elif PAGE_PATH.match(path):
+                self.serve_page(state, PAGE_PATH.match(path).group(1), fault, rng)
+            elif API_PATH.match(path):
+                sport_key, endpoint = API_PATH.match(path).groups()
+                self.serve_api(state, sport_key, endpoint)
+            else:
+                state.count('not found')
+                self.send_body(404, 'Not found', 'text/plain')
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up first, as it should on an injected timeout
+            state.count('client disconnected')
+
+    def serve_page(self, state, sport_key, fault, rng):
+        html = state.page(sport_key)
+        if html is None:
+            state.count('not found')
+            self.send_body(404, 'Not found', 'text/plain')
+            return
+        etag = '"' + hashlib.sha256(html.encode('utf-8')).hexdigest()[:32] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            state.count('not modified')
+            self.send_body(304, b'', 'text/html; charset=utf-8', {'ETag': etag})
+            return
+        data = html.encode('utf-8')
+        if fault == 'partial':
+            state.count(fault)
+            data = data[:rng.randint(len(data) // 4, 3 * len(data) // 4)]
+        state.count('pages served')
+        self.send_body(200, data, 'text/html; charset=utf-8', {'ETag': etag})
+
+    def serve_api(self, state, sport_key, endpoint):
+        payload = state.scores(sport_key)
+        if payload is None:
+            state.count('not found')
+            self.send_body(404, json.dumps({'message': f'Unknown sport {sport_key}'}), 'application/json')
+            return
+        cost = 0
+        if endpoint == 'events':
+            payload = [{key: game.get(key) for key in
+                        ('id', 'sport_key', 'sport_title', 'commence_time', 'home_team', 'away_team')}
+                       for game in payload]
+        else:
+            cost = 2 if 'daysFrom' in self.path else 1
+        with state.lock:
+            state.stats['quota used'] += cost
+            used = state.stats['quota used']
+        state.count(f'{endpoint} served')
+        self.send_body(200, json.dumps(payload), 'application/json', {
+            'x-requests-used': str(used),
+            'x-requests-remaining': str(max(QUOTA - used, 0)),
+            'x-requests-last': str(cost)
+        })
+
+def make_server(state, host='127.0.0.1', port=8765, verbose=False):
+    server = ThreadingHTTPServer((host, port), type('Handler', (MockHandler,), {'verbose': verbose}))
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the odds comparer site and the-odds-api')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', help='Directory with pages/<sport key>.html and scores/<sport key>.json')
+    parser.add_argument('--date', help='Replay the HTML archive and scores cache for this date (YYYYMMDD)')
+    parser.add_argument('--latency', type=float, default=0, help='Delay added to every response (ms)')
+    parser.add_argument('--jitter', type=float, default=0, help='Random extra delay up to this many ms')
+    parser.add_argument('--rate-limit', type=float, default=0, help='Share of requests answered with 429')
+    parser.add_argument('--timeout', type=float, default=0, help='Share of requests held for --hang seconds')
+    parser.add_argument('--partial', type=float, default=0, help='Share of pages cut off partway through')
+    parser.add_argument('--hang', type=float, default=HANG_SECONDS,
+                        help='Seconds a timed-out request is held (default: %(default)s)')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    state = MockState(args.fixtures, args.date, args.latency, args.jitter, args.rate_limit, args.timeout,
+                      args.partial, args.hang, args.retry_after, args.seed)
+    server = make_server(state, args.host, args.port, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port} "
+          f"({len(state.archived)} archived pages{', fixtures from ' + args.fixtures if args.fixtures else ''})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(state.stats), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Single entry point for every pipeline stage.
+
+Usage:
+    python scripts/odds.py fetch [--date YYYYMMDD] [--snapshot]
+    python scripts/odds.py fetch --from-archive --start 20250101 [--end 20250131] [--workers 4]
+    python scripts/odds.py results [--date yesterday]
+    python scripts/odds.py sync [--date 20250301]
+    python scripts/odds.py backfill --start 20250101 [--end 20250630] [--workers 4] [--force]
+    python scripts/odds.py sports
+
+--date takes YYYYMMDD or today/yesterday/tomorrow (New York time). Each command
+imports its stage only when it runs, so quick commands do not pay for pandas,
+requests or the HTML parsers.
+
+fetch, results, sync and backfill append a run report with per-stage timings and
+counters to data/run_reports/runs.jsonl (see run_report.py); --profile FILE also
+dumps cProfile stats for the whole command.
+
+ODDS_COMPARER_URL and ODDS_API_URL point fetch and results at other hosts, such as
+the local stand-in in mock_server.py.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import run_report
+
+RELATIVE_DATES = {'yesterday': -1, 'today': 0, 'tomorrow': 1}
+
+def resolve_date(value):
+    """YYYYMMDD for a YYYYMMDD string or today/yesterday/tomorrow in New York."""
+    if value in RELATIVE_DATES:
+        day = datetime.now(ZoneInfo('America/New_York')) + timedelta(days=RELATIVE_DATES[value])
+        return day.strftime('%Y%m%d')
+    try:
+        datetime.strptime(value, '%Y%m%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYYMMDD or one of {list(RELATIVE_DATES)}")
+    return value
+
+def run_fetch(args):
+    import save_odds
+    if args.snapshot:
+        save_odds.save_odds_snapshot()
+    elif args.from_archive:
+        save_odds.save_odds_from_archive(args.start, args.end or args.start, args.workers)
+    else:
+        save_odds.save_daily_odds(args.date)
+
+def run_results(args):
+    from results import process_results
+    return process_results(args.date)
+
+def run_sync(args):
+    from sync import sync_data
+    return sync_data(args.date)
+
+def run_backfill(args):
+    from backfill import backfill
+    start = args.start or args.date
+    backfill(start, args.end or start, args.workers, args.force)
+
+def run_sports(args):
+    from sports import DRAW_SPORTS, SPORT_KEY_MAP, load_sports
+    for sport, url in load_sports():
+        market = '3-way' if sport in DRAW_SPORTS else '2-way'
+        print(f"{sport:<40} {market}  {SPORT_KEY_MAP.get(sport, '-'):<45} {url}")
+
+def run_reported(args):
+    """Run a pipeline command under a run report, and cProfile when --profile is given."""
+    run_report.start(args.command, date=args.date, argv=args.argv)
+    status = 'error'
+    try:
+        with run_report.profiled(args.profile):
+            ok = args.handler(args)
+        status = 'failed' if ok is False else 'ok'
+    finally:
+        record = run_report.finish(status, args.report)
+        print(f"Run report: {args.command} {status} in {record['wall_s']:.2f}s "
+              f"({record['cpu_s']:.2f}s CPU){' -> ' + args.report if args.report else ''}")
+
+def main(argv=None):
+    # Options shared by every pipeline command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--report', default=run_report.REPORT_FILE,
+                        help='Run report file to append to, empty to skip (default: %(default)s)')
+    common.add_argument('--profile', metavar='FILE', help='Dump cProfile stats for the command to FILE')
+
+    parser = argparse.ArgumentParser(description='Sportsbook odds pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = subparsers.add_parser('fetch', parents=[common], help="Save a day's odds (tomorrow by default)")
+    fetch_parser.add_argument('--date', type=resolve_date, help='Target date, defaults to tomorrow')
+    fetch_parser.add_argument('--snapshot', action='store_true',
+                              help="Record intraday line changes for today's and tomorrow's games")
+    fetch_parser.add_argument('--from-archive', action='store_true',
+                              help='Rebuild game_odds files from data/archive/html instead of downloading')
+    fetch_parser.add_argument('--start', type=resolve_date, help='First target date to re-parse')
+    fetch_parser.add_argument('--end', type=resolve_date, help='Last target date to re-parse, defaults to --start')
+    fetch_parser.add_argument('--workers', type=int, help='Worker processes for --from-archive (default: CPU count)')
+    fetch_parser.set_defaults(handler=run_fetch)
+
+    results_parser = subparsers.add_parser('results', parents=[common], help="Fetch a day's scores for the games with odds")
+    results_parser.add_argument('--date', type=resolve_date, default='today', help='Game date, defaults to today')
+    results_parser.set_defaults(handler=run_results)
+
+    sync_parser = subparsers.add_parser('sync', parents=[common], help="Merge a day's odds and results into sportsbook performance")
+    sync_parser.add_argument('--date', type=resolve_date, default='today', help='Game date, defaults to today')
+    sync_parser.set_defaults(handler=run_sync)
+
+    backfill_parser = subparsers.add_parser('backfill', parents=[common], help='Rebuild results and performance for a date range')
+    backfill_parser.add_argument('--date', type=resolve_date, help='Single date to rebuild')
+    backfill_parser.add_argument('--start', type=resolve_date, help='First date')
+    backfill_parser.add_argument('--end', type=resolve_date, help='Last date, defaults to --start')
+    backfill_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    backfill_parser.add_argument('--force', action='store_true', help='Rebuild dates even if their outputs are up to date')
+    backfill_parser.set_defaults(handler=run_backfill)
+
+    sports_parser = subparsers.add_parser('sports', help='List the sports registry')
+    sports_parser.set_defaults(handler=run_sports)
+
+    args = parser.parse_args(argv)
+    if args.command == 'backfill' and not (args.start or args.date):
+        parser.error('backfill needs --date or --start')
+    if args.command == 'sports':
+        args.handler(args)
+        return
+    args.argv = ' '.join(sys.argv[1:] if argv is None else argv)
+    run_reported(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+from array import array
+from collections import deque
+from html.parser import HTMLParser
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import logging
+import os
+import re
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Tailwind class strings that mark up the comparer site's game cards
+GAME_CLASS = 'm-5 flex flex-col shadow-lg'
+TITLE_CLASS = 'text-3xl'
+DATE_CLASS = 'text-cyan-700 text-sm'
+ODDS_CONTAINER_CLASS = 'flex flex-row justify-around p-6 bg-white flex-wrap'
+ODDS_ITEM_CLASS = 'grid grid-flow-row p-3'
+BOOKMAKER_CLASS = 'text-xl'
+
+# Parser backend: 'auto' (lxml when installed, else stream), 'lxml', 'stream' or 'bs4'
+HTML_PARSER = os.getenv('ODDS_HTML_PARSER', 'auto')
+# Characters fed to the stream parser at a time; finished game cards are emitted between chunks
+STREAM_CHUNK_SIZE = 64 * 1024
+
+AMERICAN_PRICE = re.compile(r'[+-]?\d+')
+# Prices are stored as int32: long shots such as +50000 do not fit in int16
+INT32_MAX = 2 ** 31 - 1
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+}
+
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:
+    lxml_etree = lxml_html = None
+
+def convert_match_date(match_title, match_date):
+    # Convert UTC time to EST
+    try:
+        utc_time = datetime.strptime(match_date, "%b %d, %Y, %I:%M %p")
+        utc_time = utc_time.replace(tzinfo=ZoneInfo('UTC'))
+        est_time = utc_time.astimezone(ZoneInfo('America/New_York'))
+        return est_time.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception as e:
+        logger.error(f"Error converting time for {match_title}: {e}")
+        return match_date
+
+def split_match_title(match_title):
+    teams = match_title.split(' vs ')
+    return teams[0].strip(), teams[1].strip()
+
+def american_price(text):
+    """'+150 ML' -> 150; anything that is not a whole American price becomes 0, which is never a valid one."""
+    text = text.replace(' ML', '').strip()
+    if not AMERICAN_PRICE.fullmatch(text) or abs(int(text)) > INT32_MAX:
+        return 0
+    return int(text)
+
+def iter_games_bs4(html_content):
+    """Yield (match date, home, away, [(team, price, bookmaker)]) per game card."""
+    # Only the fallback backend needs BeautifulSoup
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, 'html.parser')
+    games = soup.find_all('div', class_=GAME_CLASS)
+
+    logger.info(f"Found {len(games)} games in HTML content")
+
+    for game in games:
+        match_title = game.find('h2', class_=TITLE_CLASS).text
+        match_date = game.find('p', class_=DATE_CLASS).text
+        match_date = convert_match_date(match_title, match_date)
+        home_team, away_team = split_match_title(match_title)
+
+        logger.info(f"Processing match: {home_team} vs {away_team} on {match_date} (EST)")
+
+        # Find all team spans (directly inside the game div or inside nested divs)
+        team_spans = game.find_all('span', recursive=True)
+        entries = []
+
+        for i, span in enumerate(team_spans):
+            # Skip spans that are inside grid-flow-row (these are the odds and bookmakers)
+            if span.find_parent('div', class_=ODDS_ITEM_CLASS):
+                continue
+
+            team_name = span.text.strip()
+
+            # For each team, find its odds container (the div after the span)
+            odds_container = span.find_next('div', class_=ODDS_CONTAINER_CLASS)
+            if not odds_container:
+                continue
+
+            odds_items = odds_container.find_all('div', class_=ODDS_ITEM_CLASS)
+
+            logger.info(f"Found {len(odds_items)} odds entries for {team_name}")
+
+            for odds_item in odds_items:
+                price = odds_item.find('span').text.strip()
+                bookmaker = odds_item.find('span', class_=BOOKMAKER_CLASS).text.strip()
+
+                entries.append((team_name, price, bookmaker))
+
+        yield match_date, home_team, away_team, entries
+
+class TextCapture:
+    def __init__(self):
+        self.parts = []
+
+    @property
+    def text(self):
+        return ''.join(self.parts)
+
+class OddsCardCollector:
+    """Single-pass state machine over start/end/data events that mirrors iter_games_bs4.
+
+    Every element is visited once; a team span waits in `pending` for the next odds
+    container to open, which is what bs4's find_next() resolves by walking the tree.
+    drain() hands out game cards in document order as soon as nothing later in the
+    page can change them, so only the games still open are held in memory.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.captures = []
+        self.games = deque()  # not yet emitted, in document order
+        self.game_count = 0
+        self.game_depth = 0
+        self.item_depth = 0
+        self.open_containers = []
+        self.open_items = []
+        self.pending = []
+
+    def capture(self, entry):
+        entry['capture'] = TextCapture()
+        self.captures.append(entry['capture'])
+        return entry['capture']
+
+    def start(self, tag, class_attr):
+        classes = class_attr.split() if class_attr else []
+        class_str = ' '.join(classes)
+        entry = {'tag': tag}
+        self.stack.append(entry)
+
+        if tag == 'div':
+            if class_str == GAME_CLASS:
+                entry['game'] = {'title': None, 'date': None, 'spans': [], 'closed': False}
+                self.games.append(entry['game'])
+                self.game_count += 1
+                self.game_depth += 1
+            elif class_str == ODDS_CONTAINER_CLASS:
+                entry['container'] = []
+                self.open_containers.append(entry['container'])
+                for span in self.pending:
+                    span['items'] = entry['container']
+                self.pending = []
+            elif class_str == ODDS_ITEM_CLASS:
+                entry['item'] = {'price': None, 'bookmaker': None}
+                for container in self.open_containers:
+                    container.append(entry['item'])
+                self.open_items.append(entry['item'])
+                self.item_depth += 1
+        elif tag == 'h2' and self.game_depth and (TITLE_CLASS in classes or class_str == TITLE_CLASS):
+            game = self.current_game()
+            if game['title'] is None:
+                game['title'] = self.capture(entry)
+        elif tag == 'p' and self.game_depth and class_str == DATE_CLASS:
+            game = self.current_game()
+            if game['date'] is None:
+                game['date'] = self.capture(entry)
+        elif tag == 'span':
+            capture = None
+            for item in self.open_items:
+                if item['price'] is None:
+                    item['price'] = capture = capture or self.capture(entry)
+                if item['bookmaker'] is None and (BOOKMAKER_CLASS in classes or class_str == BOOKMAKER_CLASS):
+                    item['bookmaker'] = capture = capture or self.capture(entry)
+            if self.game_depth and not self.item_depth:
+                span = {'name': capture or self.capture(entry), 'items': None}
+                self.current_game()['spans'].append(span)
+                self.pending.append(span)
+
+        if tag in VOID_ELEMENTS:
+            self.end(tag)
+
+    def end(self, tag):
+        # Close up to the most recent matching open tag, ignoring stray end tags
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i]['tag'] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            entry = self.stack.pop()
+            if 'capture' in entry:
+                self.captures.remove(entry['capture'])
+            if 'game' in entry:
+                entry['game']['closed'] = True
+                self.game_depth -= 1
+            elif 'container' in entry:
+                self.open_containers.remove(entry['container'])
+            elif 'item' in entry:
+                self.open_items.remove(entry['item'])
+                self.item_depth -= 1
+
+    def data(self, text):
+        for capture in self.captures:
+            capture.parts.append(text)
+
+    def current_game(self):
+        for entry in reversed(self.stack):
+            if 'game' in entry:
+                return entry['game']
+
+    def is_final(self, game):
+        # A closed game is final once none of its team spans can still gain odds items
+        if not game['closed']:
+            return False
+        for span in game['spans']:
+            if span['items'] is None:
+                if any(span is pending for pending in self.pending):
+                    return False
+            elif any(span['items'] is container for container in self.open_containers):
+                return False
+        return True
+
+    def drain(self, finished=False):
+        """Yield the cards of final games in document order; finished=True flushes everything."""
+        while self.games and (finished or self.is_final(self.games[0])):
+            yield self.card(self.games.popleft())
+        if finished:
+            logger.info(f"Found {self.game_count} games in HTML content")
+
+    def card(self, game):
+        match_title = game['title'].text
+        match_date = convert_match_date(match_title, game['date'].text)
+        home_team, away_team = split_match_title(match_title)
+
+        logger.info(f"Processing match: {home_team} vs {away_team} on {match_date} (EST)")
+
+        entries = []
+        for span in game['spans']:
+            if span['items'] is None:
+                continue
+            team_name = span['name'].text.strip()
+
+            logger.info(f"Found {len(span['items'])} odds entries for {team_name}")
+
+            for item in span['items']:
+                entries.append((team_name, item['price'].text.strip(), item['bookmaker'].text.strip()))
+        return match_date, home_team, away_team, entries
+
+class StreamingOddsParser(HTMLParser):
+    """Feeds the stdlib tokenizer straight into an OddsCardCollector without building a tree."""
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs).get('class'))
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs).get('class'))
+        if tag not in VOID_ELEMENTS:
+            self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+def iter_games_stream(html_content):
+    collector = OddsCardCollector()
+    parser = StreamingOddsParser(collector)
+    for start in range(0, len(html_content), STREAM_CHUNK_SIZE):
+        parser.feed(html_content[start:start + STREAM_CHUNK_SIZE])
+        yield from collector.drain()
+    parser.close()
+    yield from collector.drain(finished=True)
+
+def iter_games_lxml(html_content):
+    """Feed lxml's pull parser in chunks and drop each element once it has been handled.
+
+    An element's text (and tail) may still be growing when its event arrives, so it is
+    passed on at the next event, when the parser has moved past it.
+    """
+    collector = OddsCardCollector()
+    parser = lxml_etree.HTMLPullParser(events=('start', 'end', 'comment', 'pi'), encoding='utf-8')
+    pending = None  # (element, 'text' or 'tail') whose text is not passed on yet
+
+    def handle(events):
+        nonlocal pending
+        for event, element in events:
+            if pending is not None:
+                owner, kind = pending
+                text = owner.text if kind == 'text' else owner.tail
+                if text:
+                    collector.data(text)
+                if kind == 'tail':
+                    # Handled elements, and their earlier siblings, are no longer needed
+                    owner.clear(keep_tail=False)
+                    while owner.getprevious() is not None:
+                        del owner.getparent()[0]
+            if event == 'start':
+                collector.start(element.tag, element.get('class'))
+                pending = (element, 'text')
+            else:
+                # Comments and processing instructions only contribute their tail text
+                if event == 'end' and element.tag not in VOID_ELEMENTS:
+                    collector.end(element.tag)
+                pending = (element, 'tail') if element.getparent() is not None else None
+
+    for start in range(0, len(html_content), STREAM_CHUNK_SIZE):
+        parser.feed(html_content[start:start + STREAM_CHUNK_SIZE].encode('utf-8'))
+        handle(parser.read_events())
+        yield from collector.drain()
+    parser.close()
+    handle(parser.read_events())
+    if pending is not None and pending[1] == 'text' and pending[0].text:
+        collector.data(pending[0].text)
+    yield from collector.drain(finished=True)
+
+PARSERS = {
+    'bs4': iter_games_bs4,
+    'stream': iter_games_stream,
+    'lxml': iter_games_lxml
+}
+
+def resolve_parser(parser=None):
+    parser = parser or HTML_PARSER
+    if parser == 'auto':
+        parser = 'lxml' if lxml_html is not None else 'stream'
+    if parser == 'lxml' and lxml_html is None:
+        logger.warning("lxml is not installed, using the stream parser instead")
+        parser = 'stream'
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown HTML parser '{parser}', expected one of {sorted(PARSERS)} or 'auto'")
+    return parser
+
+class OddsColumns:
+    """Typed column buffers that game cards are written into one row at a time.
+
+    Teams (home, away and the priced team share one category list) and bookmakers
+    are stored as integer codes, prices as int32 American odds and the match date
+    once per game; to_frame() wraps the buffers in a DataFrame without copying them.
+    """
+
+    def __init__(self):
+        self.dates = []
+        self.game_home = array('i')
+        self.game_away = array('i')
+        self.games = array('i')
+        self.teams = array('i')
+        self.prices = array('i')
+        self.bookmakers = array('i')
+        self.team_codes = {}
+        self.bookmaker_codes = {}
+        self.price_cache = {}
+
+    def __len__(self):
+        return len(self.games)
+
+    def code(self, codes, name):
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(codes)
+        return code
+
+    def append(self, card):
+        match_date, home_team, away_team, entries = card
+        game = len(self.dates)
+        self.dates.append(match_date)
+        self.game_home.append(self.code(self.team_codes, home_team))
+        self.game_away.append(self.code(self.team_codes, away_team))
+        for team_name, price, bookmaker in entries:
+            american = self.price_cache.get(price)
+            if american is None:
+                american = self.price_cache[price] = american_price(price)
+                if not american:
+                    logger.warning(f"Unparseable price '{price}' from {bookmaker} for {team_name}")
+            self.games.append(game)
+            self.teams.append(self.code(self.team_codes, team_name))
+            self.prices.append(american)
+            self.bookmakers.append(self.code(self.bookmaker_codes, bookmaker))
+
+    def to_frame(self):
+        if not len(self):
+            return pd.DataFrame()
+        games = np.frombuffer(self.games, dtype=np.int32)
+        team_dtype = pd.CategoricalDtype(list(self.team_codes))
+
+        def teams(codes):
+            return pd.Categorical.from_codes(codes, dtype=team_dtype)
+
+        return pd.DataFrame({
+            'Match Date': pd.to_datetime(pd.Series(self.dates)).to_numpy()[games],
+            'Home Team': teams(np.frombuffer(self.game_home, dtype=np.int32)[games]),
+            'Away Team': teams(np.frombuffer(self.game_away, dtype=np.int32)[games]),
+            'Team': teams(np.frombuffer(self.teams, dtype=np.int32)),
+            'Price': np.frombuffer(self.prices, dtype=np.int32),
+            'Bookmaker': pd.Categorical.from_codes(
+                np.frombuffer(self.bookmakers, dtype=np.int32), categories=list(self.bookmaker_codes))
+        }, copy=False)
+
+def iter_game_cards(html_content, parser=None):
+    """Game cards from the chosen backend, in page order."""
+    return PARSERS[resolve_parser(parser)](html_content)
+
+def parse_html_to_table(html_content, parser=None):
+    """One row per (game, team, bookmaker) price.
+
+    'Match Date' is datetime64 (EST), 'Price' the int32 American price (0 when the
+    page shows something else) and the team and bookmaker columns are categoricals.
+    """
+    parser = resolve_parser(parser)
+    columns = OddsColumns()
+    try:
+        for card in PARSERS[parser](html_content):
+            columns.append(card)
+    except Exception as e:
+        if parser == 'bs4':
+            raise
+        logger.warning(f"{parser} parser failed ({e}), falling back to BeautifulSoup")
+        columns = OddsColumns()
+        for card in iter_games_bs4(html_content):
+            columns.append(card)
+    return columns.to_frame()
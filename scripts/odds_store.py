@@ -0,0 +1,237 @@
+"""Partitioned Parquet store for odds, results and sportsbook performance history.
+
+Each dataset lives under data/store/<dataset>/month=YYYYMM/data.parquet as
+zstd-compressed Parquet with a fixed schema, rows sorted by date and Sport so
+date/sport filters prune whole months and row ranges. Multi-day reads are a
+single dataset scan instead of hundreds of read_csv calls.
+
+Backfill the existing CSVs with:
+    python scripts/odds_store.py import [--datasets game_odds game_results sportsbook_performance]
+"""
+import argparse
+import glob
+import io
+import logging
+import os
+import re
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = os.path.join('data', 'store')
+DATA_DIR = 'data'
+
+# Column name -> storage type for each dataset; every row also carries its YYYYMMDD 'date'
+SCHEMAS = {
+    'game_odds': {
+        'Sport': 'string',
+        'Match Date': 'timestamp',
+        'Home Team': 'string',
+        'Away Team': 'string',
+        'Home Team Odds': 'float64',
+        'Away Team Odds': 'float64',
+        'Draw Odds': 'float64',
+        'Bookmaker': 'string',
+        'Compiled_At': 'timestamp',
+        'Event ID': 'string'
+    },
+    'game_results': {
+        'Sport': 'string',
+        'Match Date': 'date',
+        'Home Team': 'string',
+        'Away Team': 'string',
+        'Home Score': 'float64',
+        'Away Score': 'float64',
+        'Status': 'string',
+        'Game ID': 'string',
+        'Commence Time': 'timestamp'
+    },
+    'sportsbook_performance': {
+        'Sport': 'string',
+        'Match Date': 'date',
+        'Home Team': 'string',
+        'Away Team': 'string',
+        'Home Score': 'float64',
+        'Away Score': 'float64',
+        'Status': 'string',
+        'Game ID': 'string',
+        'Match Date_time': 'timestamp',
+        'Home Team Odds': 'float64',
+        'Away Team Odds': 'float64',
+        'Bookmaker': 'string',
+        'Compiled_At': 'timestamp',
+        'Event ID': 'string',
+        'Commence Time': 'timestamp',
+        'Winner': 'string'
+    }
+}
+
+ARROW_TYPES = {
+    'string': lambda: pa.string(),
+    'float64': lambda: pa.float64(),
+    'timestamp': lambda: pa.timestamp('s'),
+    'date': lambda: pa.date32()
+}
+
+def available():
+    return pa is not None
+
+def dataset_path(dataset):
+    return os.path.join(STORE_DIR, dataset)
+
+def partitioning():
+    return ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive')
+
+def arrow_schema(dataset):
+    fields = [(name, ARROW_TYPES[kind]()) for name, kind in SCHEMAS[dataset].items()]
+    return pa.schema([('date', pa.string())] + fields)
+
+def partition_file(dataset, date_str):
+    return os.path.join(dataset_path(dataset), f'month={date_str[:6]}', 'data.parquet')
+
+def parse_dates(column):
+    """Game dates as midnight datetime64, NaT where a value is not a date.
+
+    Results dates are written as YYYYMMDD (sometimes read back as floats); early
+    files used full timestamps.
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.normalize()
+    text = pd.to_numeric(column, errors='coerce').astype('Int64').astype('string')
+    dates = pd.to_datetime(text, format='%Y%m%d', errors='coerce')
+    rest = column.where(dates.isna() & column.notna())
+    if rest.notna().any():
+        dates = dates.fillna(pd.to_datetime(rest, errors='coerce', format='mixed').dt.normalize())
+    return dates
+
+def coerce_frame(df, dataset):
+    # Cast to the dataset schema; missing columns become null and unknown ones are dropped
+    coerced = pd.DataFrame(index=df.index)
+    for name, kind in SCHEMAS[dataset].items():
+        column = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype='object')
+        if kind == 'float64':
+            coerced[name] = pd.to_numeric(column, errors='coerce').astype('float64')
+        elif kind == 'timestamp':
+            coerced[name] = pd.to_datetime(column, errors='coerce').astype('datetime64[s]')
+        elif kind == 'date':
+            coerced[name] = parse_dates(column).dt.date
+        else:
+            coerced[name] = column.astype('string')
+    return coerced
+
+def write_partition(df, dataset, date_str):
+    """Replace the rows for date_str in dataset with df; returns False if pyarrow is missing."""
+    if not available():
+        logger.warning(f"pyarrow is not installed, skipping {dataset} store write")
+        return False
+
+    frame = coerce_frame(df, dataset)
+    frame.insert(0, 'date', date_str)
+
+    path = partition_file(dataset, date_str)
+    if os.path.exists(path):
+        existing = pq.read_table(path, schema=arrow_schema(dataset)).to_pandas()
+        frame = pd.concat([existing[existing['date'] != date_str], frame], ignore_index=True)
+    frame = frame.sort_values(['date', 'Sport'], kind='stable')
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(frame, schema=arrow_schema(dataset), preserve_index=False)
+    tmp_path = f'{path}.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+    logger.info(f"Stored {len(df)} {dataset} rows for {date_str} in {path}")
+    return True
+
+def read_dataset(dataset, start_date=None, end_date=None, sports=None, columns=None):
+    """Load a dataset as a DataFrame, filtered by inclusive YYYYMMDD date range and sports."""
+    if not available():
+        raise ImportError("pyarrow is required to read the odds store")
+    if not os.path.isdir(dataset_path(dataset)):
+        return pd.DataFrame(columns=columns or ['date'] + list(SCHEMAS[dataset]))
+
+    schema = arrow_schema(dataset).append(pa.field('month', pa.string()))
+    dataset_obj = ds.dataset(dataset_path(dataset), format='parquet', partitioning=partitioning(), schema=schema)
+
+    # Month bounds prune partitions, date bounds trim rows inside them
+    filters = []
+    if start_date:
+        filters += [ds.field('month') >= start_date[:6], ds.field('date') >= start_date]
+    if end_date:
+        filters += [ds.field('month') <= end_date[:6], ds.field('date') <= end_date]
+    if sports:
+        filters.append(ds.field('Sport').isin(list(sports)))
+
+    expression = None
+    for condition in filters:
+        expression = condition if expression is None else expression & condition
+
+    table = dataset_obj.to_table(columns=columns or arrow_schema(dataset).names, filter=expression)
+    return table.to_pandas()
+
+def stored_dates(dataset, start_date=None, end_date=None):
+    """Set of YYYYMMDD dates in [start_date, end_date] that have rows in the store."""
+    if not available():
+        return set()
+    return set(read_dataset(dataset, start_date, end_date, columns=['date'])['date'])
+
+def performance_rows(content):
+    """The merged-rows CSV in a sportsbook_performance file's bytes, or None when it has none."""
+    # sync.py writes the bookmaker stats table, a blank line, then the merged rows;
+    # older yesterdays_sync.py files contain only the merged rows
+    if content.startswith(b'Sport,'):
+        return content
+    parts = re.split(rb'\n\s*\n', content, maxsplit=1)
+    if len(parts) < 2 or not parts[1].strip():
+        return None
+    return parts[1]
+
+def read_performance_rows(path):
+    with open(path, 'rb') as f:
+        rows = performance_rows(f.read())
+    return pd.read_csv(io.BytesIO(rows)) if rows is not None else pd.DataFrame()
+
+def import_csvs(datasets=None, data_dir=DATA_DIR):
+    """Backfill the store from data/<dataset>_YYYYMMDD.csv files."""
+    readers = {
+        'game_odds': pd.read_csv,
+        'game_results': pd.read_csv,
+        'sportsbook_performance': read_performance_rows
+    }
+    for dataset in datasets or list(SCHEMAS):
+        files = sorted(glob.glob(os.path.join(data_dir, f'{dataset}_*.csv')))
+        imported = 0
+        for path in files:
+            match = re.search(r'_(\d{8})\.csv$', path)
+            if not match:
+                continue
+            try:
+                df = readers[dataset](path)
+            except Exception as e:
+                logger.error(f"Error reading {path}: {e}")
+                continue
+            write_partition(df, dataset, match.group(1))
+            imported += 1
+        logger.info(f"Imported {imported} of {len(files)} {dataset} files")
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Manage the partitioned Parquet odds store')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help='Backfill the store from the per-day CSV files')
+    import_parser.add_argument('--datasets', nargs='+', choices=list(SCHEMAS), default=list(SCHEMAS))
+    import_parser.add_argument('--data-dir', default=DATA_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        import_csvs(args.datasets, args.data_dir)
+
+if __name__ == "__main__":
+    main()
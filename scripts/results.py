@@ -1,153 +1,96 @@
 import pandas as pd
 from datetime import datetime, timedelta
-import requests
 import os
 from dotenv import load_dotenv
 import pytz
 
+import odds_store
+import run_report
+import team_index
+from file_utils import atomic_write
+from scores_client import commence_time_est, fetch_all_scores
+from sports import SPORT_KEY_MAP
+
 load_dotenv()
 
-def fetch_game_results(sport, sport_url):
-    api_key = os.getenv('ODDS_API_KEY')
-    
-    base_url = "https://api.the-odds-api.com/v4/sports/{url}/scores/"
-    
-    try:
-        response = requests.get(
-            base_url.format(url=sport_url),
-            params={
-                'apiKey': api_key,
-                'daysFrom': 1
-            }
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching results for {sport}: {e}")
+# The scores endpoint only looks back this many days
+MAX_DAYS_FROM = 3
+
+def scores_days_from(date_str):
+    """daysFrom value that covers date_str, or None if it is outside the API window."""
+    ny_tz = pytz.timezone('America/New_York')
+    days_ago = (datetime.now(ny_tz).date() - datetime.strptime(date_str, '%Y%m%d').date()).days
+    if days_ago < 0 or days_ago >= MAX_DAYS_FROM:
         return None
+    return days_ago + 1
 
-def process_results():
+def process_results(date_str=None, update_store=True):
     try:
         ny_tz = pytz.timezone('America/New_York')
-        today = datetime.now(ny_tz).strftime('%Y%m%d')
+        today = date_str or datetime.now(ny_tz).strftime('%Y%m%d')
         
+        # Older dates can only be served from the scores cache
+        days_from = scores_days_from(today)
+        cache_only = None
+        if days_from is None:
+            print(f"Scores for {today} are outside the API's {MAX_DAYS_FROM}-day window, using cached responses only")
+            days_from, cache_only = MAX_DAYS_FROM, True
         
         # Read today's odds file to get active leagues
         odds_file = f'data/game_odds_{today}.csv'
         if not os.path.exists(odds_file):
             raise FileNotFoundError(f"Could not find odds file: {odds_file}")
             
-        odds_df = pd.read_csv(odds_file)
-        
-        # Map sports to API keys
-        sport_key_map = {
-            'NFL': 'americanfootball_nfl',
-            'NCAAF': 'americanfootball_ncaaf', 
-            'CFL': 'americanfootball_cfl',
-            'UFL': 'americanfootball_ufl',
-            'AFL': 'aussierules_afl',
-            'MLB': 'baseball_mlb',
-            'Basketball Euroleague': 'basketball_euroleague',
-            'NBA': 'basketball_nba',
-            'WNBA': 'basketball_wnba',
-            'NCAAB': 'basketball_ncaab',
-            'WNCAAB': 'basketball_wncaab',
-            'NBL': 'basketball_nbl',
-            'Boxing': 'boxing_boxing',
-            'Big Bash': 'cricket_big_bash',
-            'Test Matches': 'cricket_test_match',
-            'NHL': 'icehockey_nhl',
-            'SHL': 'icehockey_sweden_hockey_league',
-            'MMA': 'mma_mixed_martial_arts',
-            'NRL': 'rugbyleague_nrl',
-            'Primera División - Argentina': 'soccer_argentina_primera_division',
-            'A-League': 'soccer_australia_aleague',
-            'Austrian Football Bundesliga': 'soccer_austria_bundesliga',
-            'Belgium First Div': 'soccer_belgium_first_div',
-            'Brazil Série A': 'soccer_brazil_campeonato',
-            'Brazil Série B': 'soccer_brazil_serie_b',
-            'Primera División - Chile': 'soccer_chile_campeonato',
-            'Super League - China': 'soccer_china_superleague',
-            'Denmark Superliga': 'soccer_denmark_superliga',
-            'Championship': 'soccer_efl_champ',
-            'EFL Cup': 'soccer_england_efl_cup',
-            'League 1': 'soccer_england_league1',
-            'League 2': 'soccer_england_league2',
-            'EPL': 'soccer_epl',
-            'FA Cup': 'soccer_fa_cup',
-            'FIFA World Cup': 'soccer_fifa_world_cup',
-            'Veikkausliiga - Finland': 'soccer_finland_veikkausliiga',
-            'Ligue 1 - France': 'soccer_france_ligue_one',
-            'Ligue 2 - France': 'soccer_france_ligue_two',
-            'Bundesliga - Germany': 'soccer_germany_bundesliga',
-            'Bundesliga 2 - Germany': 'soccer_germany_bundesliga2',
-            '3. Liga - Germany': 'soccer_germany_liga3',
-            'Super League - Greece': 'soccer_greece_super_league',
-            'Serie A - Italy': 'soccer_italy_serie_a',
-            'Serie B - Italy': 'soccer_italy_serie_b',
-            'J League': 'soccer_japan_j_league',
-            'K League 1': 'soccer_korea_kleague1',
-            'League of Ireland': 'soccer_league_of_ireland',
-            'Liga MX': 'soccer_mexico_ligamx',
-            'Dutch Eredivisie': 'soccer_netherlands_eredivisie',
-            'Eliteserien - Norway': 'soccer_norway_eliteserien',
-            'Ekstraklasa - Poland': 'soccer_poland_ekstraklasa',
-            'Primeira Liga - Portugal': 'soccer_portugal_primeira_liga',
-            'La Liga - Spain': 'soccer_spain_la_liga',
-            'La Liga 2 - Spain': 'soccer_spain_segunda_division',
-            'Premiership - Scotland': 'soccer_spl',
-            'Allsvenskan - Sweden': 'soccer_sweden_allsvenskan',
-            'Superettan - Sweden': 'soccer_sweden_superettan',
-            'Swiss Superleague': 'soccer_switzerland_superleague',
-            'Turkey Super League': 'soccer_turkey_super_league',
-            'UEFA Europa Conference League': 'soccer_uefa_europa_conference_league',
-            'UEFA Champions League': 'soccer_uefa_champs_league',
-            'UEFA Champions League Qualification': 'soccer_uefa_champs_league_qualification',
-            'UEFA Europa League': 'soccer_uefa_europa_league',
-            'UEFA Euro 2024': 'soccer_uefa_european_championship',
-            'UEFA Euro Qualification': 'soccer_uefa_euro_qualification',
-            'Copa América': 'soccer_conmebol_copa_america',
-            'Copa Libertadores': 'soccer_conmebol_copa_libertadores',
-            'MLS': 'soccer_usa_mls',
-            'ATP Australian Open': 'tennis_atp_aus_open_singles',
-            'ATP Canadian Open': 'tennis_atp_canadian_open',
-            'ATP China Open': 'tennis_atp_china_open',
-            'ATP Cincinnati Open': 'tennis_atp_cincinnati_open',
-            'ATP French Open': 'tennis_atp_french_open',
-            'ATP Paris Masters': 'tennis_atp_paris_masters',
-            'ATP Shanghai Masters': 'tennis_atp_shanghai_masters',
-            'ATP US Open': 'tennis_atp_us_open',
-            'ATP Wimbledon': 'tennis_atp_wimbledon',
-            'WTA Australian Open': 'tennis_wta_aus_open_singles',
-            'WTA Canadian Open': 'tennis_wta_canadian_open',
-            'WTA China Open': 'tennis_wta_china_open',
-            'WTA Cincinnati Open': 'tennis_wta_cincinnati_open',
-            'WTA French Open': 'tennis_wta_french_open',
-            'WTA US Open': 'tennis_wta_us_open',
-            'WTA Wimbledon': 'tennis_wta_wimbledon',
-            'WTA Wuhan Open': 'tennis_wta_wuhan_open'
-        }
+        with run_report.stage('read'):
+            odds_df = pd.read_csv(odds_file)
+        run_report.count('odds rows in', len(odds_df))
         
         results = []
         # Get unique sports from odds file
         active_sports = odds_df['Sport'].unique()
         
-        for sport in active_sports:
-            # Get URL for this sport
-            sport_url = sport_key_map.get(sport)
-            if sport_url:
-                api_results = fetch_game_results(sport, sport_url)
+        # Fetch scores for every active sport at once
+        sport_urls = {sport: SPORT_KEY_MAP[sport] for sport in active_sports if sport in SPORT_KEY_MAP}
+        with run_report.stage('scores api'):
+            all_api_results = fetch_all_scores(sport_urls, days_from=days_from, date_str=today, cache_only=cache_only)
+        
+        with run_report.stage('match'):
+            # Index every (sport, home, away) in the odds file once for O(1) lookups, by team ID
+            # so API spellings that differ from the odds site still match (see team_index.py)
+            teams = team_index.get_index()
+            odds_games = set(zip(
+                odds_df['Sport'],
+                teams.team_ids(odds_df['Sport'], odds_df['Home Team']),
+                teams.team_ids(odds_df['Sport'], odds_df['Away Team'])
+            ))
+            # Odds saved with their API event ID match on it directly
+            odds_event_ids = set(odds_df['Event ID'].dropna()) if 'Event ID' in odds_df.columns else set()
+            matched_count = 0
+            dropped_count = 0
+            # Today's API games without an odds game of the same names, for team_index rebuild
+            unmatched = []
+        
+            for sport in active_sports:
+                # Get URL for this sport
+                sport_url = SPORT_KEY_MAP.get(sport)
+                if sport_url:
+                    api_results = all_api_results.get(sport)
                 
-                if api_results:
-                    # Get games for this sport from odds file
-                    sport_games = odds_df[odds_df['Sport'] == sport]
-                    
-                    for match in api_results:
-                        # Check if this game exists in our odds data
-                        if any((match['home_team'] == game['Home Team'] and 
-                               match['away_team'] == game['Away Team']) 
-                               for _, game in sport_games.iterrows()):
-                            
+                    if api_results:
+                        for match in api_results:
+                            # Check if this game exists in our odds data
+                            home_id = teams.lookup(sport, match['home_team'])
+                            away_id = teams.lookup(sport, match['away_team'])
+                            if match['id'] not in odds_event_ids and (sport, home_id, away_id) not in odds_games:
+                                dropped_count += 1
+                                commence_time = commence_time_est(match.get('commence_time'))
+                                if commence_time is None or commence_time[:10].replace('-', '') == today:
+                                    unmatched.append((sport, match['home_team'], match['away_team'],
+                                                      commence_time, match['id']))
+                                continue
+                        
+                            matched_count += 1
+                        
                             result = {
                                 'Sport': sport,
                                 'Match Date': today,
@@ -156,24 +99,45 @@ def process_results():
                                 'Home Score': None,
                                 'Away Score': None,
                                 'Status': 'Completed' if match.get('completed') else 'Unknown',
-                                'Game ID': match['id']
+                                'Game ID': match['id'],
+                                'Commence Time': commence_time_est(match.get('commence_time'))
                             }
-                            
+                        
                             if match.get('completed') and match.get('scores'):
                                 for score in match['scores']:
                                     if score['name'] == match['home_team']:
                                         result['Home Score'] = score['score']
                                     elif score['name'] == match['away_team']:
                                         result['Away Score'] = score['score']
-                                
+                            
                             results.append(result)
         
+        print(f"Matched {matched_count} API results to odds games, dropped {dropped_count} without odds")
+        run_report.count('results matched', matched_count)
+        run_report.count('results dropped', dropped_count)
+        # Backfill workers run days in parallel, so only the single-day path writes the shared log
+        if update_store:
+            team_index.record_unmatched(today, unmatched)
+            run_report.count('unmatched games logged', len(unmatched))
+        
         if results:
             results_df = pd.DataFrame(results)
             
             output_file = f'data/game_results_{today}.csv'
-            results_df.to_csv(output_file, index=False)
+            # Never trade a results file for one with fewer games (e.g. a partly cached day)
+            if os.path.exists(output_file):
+                existing_games = len(pd.read_csv(output_file))
+                if existing_games > len(results_df):
+                    print(f"Keeping {output_file}: it has {existing_games} games, the new results only {len(results_df)}")
+                    run_report.count('results kept', existing_games)
+                    return True
+            with run_report.stage('write'), atomic_write(output_file) as f:
+                results_df.to_csv(f, index=False)
+            run_report.count('rows written', len(results_df))
             print(f"Results saved to {output_file}")
+            if update_store:
+                with run_report.stage('store'):
+                    odds_store.write_partition(results_df, 'game_results', today)
             
             return True
             
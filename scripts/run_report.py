@@ -0,0 +1,184 @@
+"""Per-run instrumentation: stage timings and counters written as one JSON line per run.
+
+Pipeline code wraps its stages in run_report.stage(name, sport) and bumps counters
+with run_report.count(name, value, sport); both work whether or not a run was
+started, so modules stay usable on their own. odds.py starts a report for each
+command and appends it to data/run_reports/runs.jsonl:
+
+    {"command": "fetch", "date": "20250301", "started_at": ..., "wall_s": ..., "cpu_s": ...,
+     "max_rss_mb": ..., "status": "ok",
+     "stages": {"fetch": {"calls": 60, "wall_s": ..., "cpu_s": ...}, ...},
+     "counters": {"bytes downloaded": ..., "api requests": ..., ...},
+     "sports": {"NBA": {"fetch wall_s": ..., "parse wall_s": ..., "rows out": ...}, ...}}
+
+A stage's wall_s sums all its calls, so stages run from threads (fetch) can add
+up to more than the run's wall time. Stage CPU time is the calling thread's; worker
+processes send their own parts() back to be merged, or show up as wall time only.
+
+Usage:
+    python scripts/run_report.py [--last 7]     # compare recent runs stage by stage
+"""
+import argparse
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FILE = os.getenv('ODDS_RUN_REPORT', os.path.join('data', 'run_reports', 'runs.jsonl'))
+
+class RunReport:
+    def __init__(self, command=None, **fields):
+        self.command = command
+        self.fields = fields
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.stages = {}
+        self.counters = {}
+        self.sports = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, sport=None):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self.lock:
+                totals = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+                totals['calls'] += 1
+                totals['wall_s'] += wall
+                totals['cpu_s'] += cpu
+                if sport is not None:
+                    per_sport = self.sports.setdefault(sport, {})
+                    per_sport[f'{name} wall_s'] = per_sport.get(f'{name} wall_s', 0.0) + wall
+
+    def count(self, name, value=1, sport=None):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            if sport is not None:
+                per_sport = self.sports.setdefault(sport, {})
+                per_sport[name] = per_sport.get(name, 0) + value
+
+    def set(self, name, value):
+        # Point-in-time values such as the API quota left
+        with self.lock:
+            self.counters[name] = value
+
+    def parts(self):
+        # Picklable stages, counters and per-sport values, for merge() in another process
+        return self.stages, self.counters, self.sports
+
+    def merge(self, parts):
+        """Fold a worker process's parts() into this report."""
+        stages, counters, sports = parts
+        with self.lock:
+            for name, totals in stages.items():
+                mine = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+                for key, value in totals.items():
+                    mine[key] += value
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for sport, values in sports.items():
+                mine = self.sports.setdefault(sport, {})
+                for key, value in values.items():
+                    mine[key] = mine.get(key, 0) + value
+
+    def to_record(self, status='ok'):
+        def rounded(values):
+            return {key: round(value, 4) if isinstance(value, float) else value for key, value in values.items()}
+
+        max_rss_mb = None
+        if resource is not None:
+            max_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        return {
+            'command': self.command,
+            **self.fields,
+            'started_at': self.started_at,
+            'wall_s': round(time.perf_counter() - self.wall_start, 4),
+            'cpu_s': round(time.process_time() - self.cpu_start, 4),
+            'max_rss_mb': max_rss_mb,
+            'status': status,
+            'stages': {name: rounded(totals) for name, totals in self.stages.items()},
+            'counters': rounded(self.counters),
+            'sports': {sport: rounded(values) for sport, values in sorted(self.sports.items())}
+        }
+
+_current = RunReport()
+
+def start(command, **fields):
+    """Begin a new report for this process; stages and counters after this call go into it."""
+    global _current
+    _current = RunReport(command, **fields)
+    return _current
+
+def current():
+    return _current
+
+def stage(name, sport=None):
+    return _current.stage(name, sport)
+
+def count(name, value=1, sport=None):
+    _current.count(name, value, sport)
+
+def set_value(name, value):
+    _current.set(name, value)
+
+def merge(parts):
+    _current.merge(parts)
+
+def finish(status='ok', path=REPORT_FILE):
+    """Append the current report to path as one JSON line and return it."""
+    record = _current.to_record(status)
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
+
+@contextmanager
+def profiled(path=None):
+    """Run the block under cProfile and dump the stats to path (inspect with python -m pstats)."""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profiler.dump_stats(path)
+
+def load_reports(path=REPORT_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare recent pipeline run reports')
+    parser.add_argument('--last', type=int, default=7, help='Number of runs per command to show')
+    parser.add_argument('--file', default=REPORT_FILE, help='Run report file')
+    args = parser.parse_args()
+
+    reports = load_reports(args.file)
+    for command in sorted({report['command'] for report in reports}):
+        print(f"== {command}")
+        for report in [report for report in reports if report['command'] == command][-args.last:]:
+            stages = ', '.join(f"{name} {totals['wall_s']:.2f}s" for name, totals in report['stages'].items())
+            print(f"{report['started_at']} {report.get('date') or '-'} {report['status']} "
+                  f"{report['wall_s']:.2f}s wall, {report['cpu_s']:.2f}s cpu: {stages}")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,32 @@
+import json
 import requests
-from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import logging
+import multiprocessing
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 import pytz
 
+import arbitrage
+import html_archive
+import line_history
+import odds_store
+import run_report
+import sport_activity
+import team_index
+from file_utils import atomic_write
+from odds_parser import parse_html_to_table
+from scores_client import MAX_RETRIES, RETRY_STATUSES, backoff_delay, commence_time_est, fetch_all_events
+from sports import DRAW_SPORTS, SPORT_KEY_MAP, load_sports
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,224 +34,573 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def download_odds_html(url):
-    try:
-        full_url = f"https://sportsbook-odds-comparer.vercel.app{url}"
-        response = requests.get(full_url)
-        response.raise_for_status()
-        html = response.text
-        return html
-    except requests.RequestException as e:
-        logger.error(f"Error downloading odds: {e}")
-        return None
+# ODDS_COMPARER_URL points the fetch stage at another host, e.g. scripts/mock_server.py
+COMPARER_BASE_URL = os.getenv('ODDS_COMPARER_URL', 'https://sportsbook-odds-comparer.vercel.app').rstrip('/')
 
-def parse_html_to_table(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    games = soup.find_all('div', class_='m-5 flex flex-col shadow-lg')
-    
-    logger.info(f"Found {len(games)} games in HTML content")
-    
-    all_data = []
-    for game in games:
-        match_title = game.find('h2', class_='text-3xl').text
-        match_date = game.find('p', class_='text-cyan-700 text-sm').text
-        
-        # Convert UTC time to EST
-        try:
-            utc_time = datetime.strptime(match_date, "%b %d, %Y, %I:%M %p")
-            utc_time = utc_time.replace(tzinfo=ZoneInfo('UTC'))
-            est_time = utc_time.astimezone(ZoneInfo('America/New_York'))
-            match_date = est_time.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception as e:
-            logger.error(f"Error converting time for {match_title}: {e}")
-            pass
-        
-        teams = match_title.split(' vs ')
-        home_team = teams[0].strip()
-        away_team = teams[1].strip()
-        
-        logger.info(f"Processing match: {home_team} vs {away_team} on {match_date} (EST)")
-        
-        # Find all team spans (directly inside the game div or inside nested divs)
-        team_spans = game.find_all('span', recursive=True)
-        
-        for i, span in enumerate(team_spans):
-            # Skip spans that are inside grid-flow-row (these are the odds and bookmakers)
-            if span.find_parent('div', class_='grid grid-flow-row p-3'):
-                continue
-                
-            team_name = span.text.strip()
-            
-            # For each team, find its odds container (the div after the span)
-            odds_container = span.find_next('div', class_='flex flex-row justify-around p-6 bg-white flex-wrap')
-            if not odds_container:
-                continue
-                
-            odds_items = odds_container.find_all('div', class_='grid grid-flow-row p-3')
-            
-            logger.info(f"Found {len(odds_items)} odds entries for {team_name}")
-            
-            for odds_item in odds_items:
-                price = odds_item.find('span').text.strip()
-                bookmaker = odds_item.find('span', class_='text-xl').text.strip()
-                
-                all_data.append({
-                    'Match Date': match_date,
-                    'Home Team': home_team,
-                    'Away Team': away_team,
-                    'Team': team_name,
-                    'Price': price,
-                    'Bookmaker': bookmaker
-                })
-    
-    return pd.DataFrame(all_data)
+# Fetch stage tuning: number of concurrent downloads and the per-host request rate
+FETCH_WORKERS = int(os.getenv('ODDS_FETCH_WORKERS', '8'))
+REQUESTS_PER_SECOND = float(os.getenv('ODDS_REQUESTS_PER_SECOND', '10'))
+REQUEST_TIMEOUT = float(os.getenv('ODDS_REQUEST_TIMEOUT', '30'))
 
-def clean_table(df, sport):
-    def american_to_decimal(american_odds):
+# Parse/clean stage: worker processes for the CPU-bound parsing of downloaded pages;
+# 0 or 1 parses in this process (easier to debug)
+PARSE_WORKERS = int(os.getenv('ODDS_PARSE_WORKERS', str(os.cpu_count() or 1)))
+
+# Per-URL validators (ETag, Last-Modified, body hash) from the last poll of each mode;
+# committed with the data so CI runs can send conditional requests
+FETCH_STATE_DIR = os.path.join('data', 'fetch_state')
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(full_url):
+    host = urlparse(full_url).netloc
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(REQUESTS_PER_SECOND)
+        return _rate_limiters[host]
+
+def create_session(pool_size=FETCH_WORKERS):
+    # One keep-alive pool shared by every worker thread
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def download_odds_html(url, session=None):
+    return fetch_odds_page(url, session)[0]
+
+def fetch_odds_page(url, session=None, validators=None, need_body=True):
+    """Download a page and return (html, changed).
+
+    With a validators dict ({url: {'etag', 'last_modified', 'sha256'}}) the request is
+    conditional and the dict is updated in place. A 304, or a 200 whose body hash is
+    the one seen last time, comes back with changed=False; on 304 the body is
+    restored from the HTML archive, or left as None when need_body is False. Nothing
+    is written to the archive here; callers that keep pages use save_snapshot. Rate
+    limiting (429), server errors and timeouts are retried up to MAX_RETRIES times,
+    honouring Retry-After, as the scores client does.
+    """
+    known = validators.get(url, {}) if validators is not None else {}
+    headers = {}
+    # A 304 is only usable while the archived body can stand in for it, or no body is needed
+    if not need_body or html_archive.has_object(known.get('sha256')):
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+
+    full_url = f"{COMPARER_BASE_URL}{url}"
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
         try:
-            american = int(american_odds.replace(' ML', ''))
-            if american > 0:
-                return round(american/100 + 1, 3)
-            else:
-                return round(100/abs(american) + 1, 3)
-        except Exception as e:
-            logger.error(f"Error converting odds '{american_odds}': {e}")
-            return None
-    
-    cleaned_data = []
-    
-    # Define sports that can have draws
-    draw_sports = {
-        'Primera División - Argentina', 'A-League', 'Austrian Football Bundesliga', 
-        'Belgium First Div', 'Copa Libertadores', 'Denmark Superliga', 'Championship', 
-        'EFL Cup', 'League 1', 'League 2', 'EPL', 'FA Cup', 'Ligue 1 - France', 
-        'Ligue 2 - France', 'Bundesliga - Germany', 'Bundesliga 2 - Germany', 
-        '3. Liga - Germany', 'Super League - Greece', 'Serie A - Italy', 
-        'Serie B - Italy', 'League of Ireland', 'Liga MX', 'Dutch Eredivisie', 
-        'Primeira Liga - Portugal', 'La Liga - Spain', 'La Liga 2 - Spain', 
-        'Premiership - Scotland', 'Swiss Superleague', 'Turkey Super League', 
-        'UEFA Champions League', 'UEFA Europa Conference League', 'UEFA Europa League'
+            get_rate_limiter(full_url).wait()
+            response = (session or requests).get(full_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            run_report.count('http requests')
+            if response.status_code == 304 and headers:
+                run_report.count('http not modified')
+                return (html_archive.load_snapshot(known['sha256']) if need_body else None), False
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                break
+            retry_after = response.headers.get('Retry-After')
+            error = f"HTTP {response.status_code}"
+        except (requests.Timeout, requests.ConnectionError) as e:
+            error = e
+        except requests.RequestException as e:
+            logger.error(f"Error downloading odds: {e}")
+            run_report.count('http errors')
+            return None, True
+
+        if attempt == MAX_RETRIES:
+            logger.error(f"Error downloading odds: {error} (gave up after {attempt + 1} attempts)")
+            run_report.count('http errors')
+            return None, True
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"Retrying {url} in {delay:.1f}s after {error}")
+        run_report.count('http retries')
+        time.sleep(delay)
+
+    html = response.text
+    run_report.count('bytes downloaded', len(response.content))
+
+    if validators is None:
+        return html, True
+    sha256 = html_archive.content_hash(html)
+    validators[url] = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': sha256
     }
-    unique_matches = df[['Match Date', 'Home Team', 'Away Team']].drop_duplicates()
-    
-    for _, match in unique_matches.iterrows():
-        match_data = df[
-            (df['Match Date'] == match['Match Date']) & 
-            (df['Home Team'] == match['Home Team']) &
-            (df['Away Team'] == match['Away Team'])
-        ]
-        
-        for bookmaker in match_data['Bookmaker'].unique():
-            match_odds = match_data[match_data['Bookmaker'] == bookmaker]
-            
-            # Check if number of odds entries is valid for the sport
-            expected_odds = 3 if sport in draw_sports else 2
-            if len(match_odds) != expected_odds:
-                logger.warning(f"Skipping {bookmaker} for {match['Home Team']} vs {match['Away Team']} - "
-                             f"expected {expected_odds} odds entries, found {len(match_odds)}")
-                continue
-            
-            try:
-                home_odds = match_odds[match_odds['Team'] == match['Home Team']]['Price'].iloc[0]
-                away_odds = match_odds[match_odds['Team'] == match['Away Team']]['Price'].iloc[0]
-                
-                home_team_odds = american_to_decimal(home_odds)
-                away_team_odds = american_to_decimal(away_odds)
-                
-                # Create base entry
-                entry = {
-                    'Sport': sport,
-                    'Match Date': match['Match Date'],
-                    'Home Team': match['Home Team'],
-                    'Away Team': match['Away Team'],
-                    'Home Team Odds': home_team_odds,
-                    'Away Team Odds': away_team_odds,
-                    'Bookmaker': bookmaker
-                }
-                
-                # Add draw odds for sports that can have draws
-                if sport in draw_sports and expected_odds == 3:
-                    # Find the draw entry (not home team and not away team)
-                    draw_entry = match_odds[
-                        (match_odds['Team'] != match['Home Team']) & 
-                        (match_odds['Team'] != match['Away Team'])
-                    ]
-                    
-                    if not draw_entry.empty:
-                        draw_odds = draw_entry['Price'].iloc[0]
-                        draw_odds_decimal = american_to_decimal(draw_odds)
-                        entry['Draw Odds'] = draw_odds_decimal
-                    else:
-                        logger.warning(f"Draw odds not found for {match['Home Team']} vs {match['Away Team']} with {bookmaker}")
-                
-                if home_team_odds and away_team_odds:
-                    cleaned_data.append(entry)
-            except Exception as e:
-                logger.error(f"Error processing odds for {bookmaker} in {match['Home Team']} vs {match['Away Team']}: {e}")
-                continue
-    
-    return pd.DataFrame(cleaned_data)
+    return html, sha256 != known.get('sha256')
 
-def save_daily_odds():
-    # Read sports URLs
-    sports_df = pd.read_csv('data/sports_url.csv')
-    
+def load_fetch_state(mode):
+    path = os.path.join(FETCH_STATE_DIR, f'{mode}.json')
+    if not os.path.exists(path):
+        return {'dates': [], 'pages': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_fetch_state(mode, state):
+    os.makedirs(FETCH_STATE_DIR, exist_ok=True)
+    with atomic_write(os.path.join(FETCH_STATE_DIR, f'{mode}.json'), encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+
+def american_to_decimal(prices):
+    """Convert American prices (ints, or strings such as '+150 ML') to decimal odds; 0 and unparseable prices become NaN."""
+    prices = np.asarray(prices)
+    if np.issubdtype(prices.dtype, np.number):
+        american = prices.astype(float)
+    else:
+        text = pd.Series(prices).astype(str).str.replace(' ML', '', regex=False).str.strip()
+        american = pd.to_numeric(text.where(text.str.fullmatch(r'[+-]?\d+')), errors='coerce').to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(american > 0, american / 100 + 1, 100 / np.abs(american) + 1)
+    decimal[american == 0] = np.nan
+    return np.round(decimal, 3)
+
+def first_row_per_group(group_ids, mask, n_groups):
+    # Position of the first row satisfying mask in each group, -1 where there is none
+    rows = np.flatnonzero(mask)
+    groups, first_index = np.unique(group_ids[rows], return_index=True)
+    first = np.full(n_groups, -1)
+    first[groups] = rows[first_index]
+    return first
+
+def clean_table(df, sport):
+    if df.empty:
+        return pd.DataFrame()
+
+    df = df.reset_index(drop=True)
+    match_cols = ['Match Date', 'Home Team', 'Away Team']
+    is_draw_sport = sport in DRAW_SPORTS
+    expected_odds = 3 if is_draw_sport else 2
+
+    # One group per (match, bookmaker), ordered by match then bookmaker first appearance
+    group_ids = df.groupby(match_cols + ['Bookmaker'], sort=False, dropna=False).ngroup().to_numpy()
+    n_groups = group_ids.max() + 1
+    counts = np.bincount(group_ids, minlength=n_groups)
+    group_rows = first_row_per_group(group_ids, np.ones(len(df), dtype=bool), n_groups)
+    match_ids = df.groupby(match_cols, sort=False, dropna=False).ngroup().to_numpy()
+    order = np.lexsort((group_rows, match_ids[group_rows]))
+
+    # Pivot each group's outcomes into home/away/draw price rows; the parser's team
+    # columns share one category list, so comparing their codes compares the names
+    team, home, away = (df[column] for column in ('Team', 'Home Team', 'Away Team'))
+    if isinstance(team.dtype, pd.CategoricalDtype) and team.dtype == home.dtype == away.dtype:
+        team, home, away = team.cat.codes, home.cat.codes, away.cat.codes
+    team = team.to_numpy()
+    is_home = team == home.to_numpy()
+    is_away = team == away.to_numpy()
+    home_rows = first_row_per_group(group_ids, is_home, n_groups)
+    away_rows = first_row_per_group(group_ids, is_away, n_groups)
+    draw_rows = first_row_per_group(group_ids, ~is_home & ~is_away, n_groups)
+
+    prices = df['Price'].to_numpy()
+    decimal = np.append(american_to_decimal(prices), np.nan)  # row -1 reads NaN
+
+    # Check if number of odds entries is valid for the sport
+    valid_count = counts == expected_odds
+    missing_team = valid_count & ((home_rows < 0) | (away_rows < 0))
+    priced = valid_count & ~missing_team
+    has_draw = priced & is_draw_sport & (draw_rows >= 0)
+    missing_draw = priced & is_draw_sport & (draw_rows < 0)
+
+    home_odds = np.where(priced, decimal[home_rows], np.nan)
+    away_odds = np.where(priced, decimal[away_rows], np.nan)
+    draw_odds = np.where(has_draw, decimal[draw_rows], np.nan)
+    bad_price = (
+        (priced & np.isnan(home_odds)) | (priced & np.isnan(away_odds)) |
+        (has_draw & np.isnan(draw_odds))
+    )
+    keep = priced & ~np.isnan(home_odds) & ~np.isnan(away_odds)
+
+    # Only groups that need a log message are visited one by one
+    flagged = order[(~valid_count | missing_team | missing_draw | bad_price)[order]]
+    for g in flagged:
+        first = group_rows[g]
+        label = f"{df.at[first, 'Home Team']} vs {df.at[first, 'Away Team']}"
+        bookmaker = df.at[first, 'Bookmaker']
+
+        if not valid_count[g]:
+            logger.warning(f"Skipping {bookmaker} for {label} - "
+                         f"expected {expected_odds} odds entries, found {counts[g]}")
+            continue
+        if missing_team[g]:
+            missing = ' and '.join(side for side, rows in (('home', home_rows), ('away', away_rows)) if rows[g] < 0)
+            logger.error(f"Error processing odds for {bookmaker} in {label}: no {missing} team price")
+            continue
+        for row in (home_rows[g], away_rows[g], draw_rows[g] if has_draw[g] else -1):
+            if row >= 0 and np.isnan(decimal[row]):
+                logger.error(f"Error converting odds '{prices[row]}': not a valid American price")
+        if missing_draw[g]:
+            logger.warning(f"Draw odds not found for {label} with {bookmaker}")
+
+    kept = order[keep[order]]
+    if len(kept) == 0:
+        return pd.DataFrame()
+
+    cleaned_df = df.loc[group_rows[kept], match_cols + ['Bookmaker']].reset_index(drop=True)
+    # Only the kept rows' names are turned back into strings
+    for column in ('Home Team', 'Away Team', 'Bookmaker'):
+        cleaned_df[column] = cleaned_df[column].astype(str)
+    cleaned_df.insert(0, 'Sport', sport)
+    cleaned_df.insert(4, 'Home Team Odds', home_odds[kept])
+    cleaned_df.insert(5, 'Away Team Odds', away_odds[kept])
+
+    # Add draw odds for sports that can have draws
+    if has_draw[kept].any():
+        cleaned_df['Draw Odds'] = draw_odds[kept]
+
+    return cleaned_df
+
+def fetch_odds_pages(sports, max_workers=FETCH_WORKERS, validators=None, need_body=True):
+    """Download (sport, url) pages concurrently, yielding (index, html, changed) as each one completes."""
+    if not sports:
+        return
+
+    def fetch(sport, url, session):
+        with run_report.stage('fetch', sport):
+            return fetch_odds_page(url, session, validators, need_body)
+
+    with create_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, (sport, url) in enumerate(sports):
+            logger.info(f"Processing {sport} odds from {url}...")
+            futures[executor.submit(fetch, sport, url, session)] = i
+        for future in as_completed(futures):
+            yield (futures[future],) + future.result()
+
+def process_sport_odds(sport, html_content, target_date, entries=None):
+    if not html_content:
+        logger.error(f"Failed to download HTML content for {sport}")
+        return None
+
+    # A page cut off mid-card cannot be parsed; skip the sport like a failed download
+    try:
+        with run_report.stage('parse', sport):
+            raw_df = parse_html_to_table(html_content)
+    except Exception as e:
+        logger.error(f"Failed to parse odds page for {sport}: {e}")
+        run_report.count('parse errors', sport=sport)
+        return None
+    run_report.count('rows parsed', len(raw_df), sport)
+    if entries is not None:
+        entries[sport] = len(raw_df)
+    if raw_df.empty:
+        logger.warning(f"No entries found for {sport}, skipping...")
+        return None
+
+    # Filter for tomorrow's games only (EST); snapshots pass several dates
+    target_dates = target_date if isinstance(target_date, (list, tuple, set)) else [target_date]
+    filtered_df = raw_df[raw_df['Match Date'].dt.date.isin(target_dates)]
+
+    logger.info(f"Found {len(raw_df)} total entries, {len(filtered_df)} entries for tomorrow (EST)")
+
+    if filtered_df.empty:
+        logger.warning(f"No games tomorrow for {sport}, skipping...")
+        return None
+
+    with run_report.stage('clean', sport):
+        cleaned_sport_df = clean_table(filtered_df, sport)
+    run_report.count('rows in', len(filtered_df), sport)
+    run_report.count('rows out', len(cleaned_sport_df), sport)
+    logger.info(f"Cleaned data for {sport}: {len(cleaned_sport_df)} entries")
+    return cleaned_sport_df
+
+def save_daily_odds(date_str=None):
+    """Save the odds for date_str's games (YYYYMMDD), tomorrow in EST by default."""
     # Use EST timezone for all date operations
     est_tz = ZoneInfo('America/New_York')
     current_date_est = datetime.now(est_tz)
-    current_date_str = current_date_est.strftime('%Y%m%d')
     
-    # Get tomorrow's date for filtering (in EST)
-    tomorrow_est = (current_date_est + timedelta(days=1)).date()
-    tomorrow_date_str = tomorrow_est.strftime('%Y%m%d')
+    # Tomorrow's date unless one is given (in EST)
+    if date_str:
+        target_est = datetime.strptime(date_str, '%Y%m%d').date()
+    else:
+        target_est = (current_date_est + timedelta(days=1)).date()
+    target_date_str = target_est.strftime('%Y%m%d')
     
-    logger.info(f"Processing odds for tomorrow's date: {tomorrow_est} (EST)")
+    logger.info(f"Processing odds for target date: {target_est} (EST)")
     
-    all_cleaned_data = []
-    
-    for _, row in sports_df.iterrows():
-        sport = row['Sport']
-        url = row['URL']
-        
-        logger.info(f"Processing {sport} odds from {url}...")
-        
-        html_content = download_odds_html(url)
-        if html_content:
-            raw_df = parse_html_to_table(html_content)
-            
-            if not raw_df.empty:
-                # Convert Match Date to datetime (already in EST from parse_html_to_table)
-                raw_df['Match Date'] = pd.to_datetime(raw_df['Match Date'])
-                
-                # Filter for tomorrow's games only (EST)
-                filtered_df = raw_df[raw_df['Match Date'].dt.date == tomorrow_est]
-                
-                logger.info(f"Found {len(raw_df)} total entries, {len(filtered_df)} entries for tomorrow (EST)")
-                
-                if not filtered_df.empty:
-                    cleaned_sport_df = clean_table(filtered_df, sport)
-                    logger.info(f"Cleaned data for {sport}: {len(cleaned_sport_df)} entries")
-                    all_cleaned_data.append(cleaned_sport_df)
-                else:
-                    logger.warning(f"No games tomorrow for {sport}, skipping...")
-            else:
-                logger.warning(f"No entries found for {sport}, skipping...")
-        else:
-            logger.error(f"Failed to download HTML content for {sport}")
-
-    if all_cleaned_data:
-        final_df = pd.concat(all_cleaned_data, ignore_index=True)
-        # Add compilation timestamp in EST
-        final_df['Compiled_At'] = datetime.now(est_tz).strftime('%Y-%m-%d %H:%M:%S')
-        
-        logger.info(f"Total compiled odds entries: {len(final_df)}")
-        
-        # Save with tomorrow's date
-        tomorrow_filename = f'data/game_odds_{tomorrow_date_str}.csv'
-        final_df.to_csv(tomorrow_filename, index=False)
-        logger.info(f"Tomorrow's odds data saved to {tomorrow_filename} (EST)")
+    sports = load_sports()
+
+    # Off-season sports are only checked every few days (see sport_activity.py)
+    activity = sport_activity.load_index()
+    sports, skipped = sport_activity.select_sports(sports, target_date_str, activity)
+    logger.info(f"Polling {len(sports)} sports, skipping {len(skipped)} off-season: {', '.join(skipped)}")
+
+    state = load_fetch_state('daily')
+    entries = {}
+    final_df = compile_odds(sports, target_est, est_tz, archive_date_str=target_date_str,
+                            validators=state['pages'], entries=entries)
+    save_fetch_state('daily', state)
+    game_sports = set(final_df['Sport']) if final_df is not None else set()
+    sport_activity.record_poll(activity, target_date_str, [sport for sport, _ in sports], entries, game_sports)
+    sport_activity.save_index(activity)
+    if final_df is not None:
+        write_daily_odds(attach_event_ids(final_df), target_date_str)
     else:
-        logger.warning("No games found for tomorrow (EST)")
+        logger.warning(f"No games found for {target_est} (EST)")
+
+def attach_event_ids(final_df):
+    """Add the-odds-api's ID for each game as 'Event ID' so results can join on it."""
+    final_df['Event ID'] = None
+    if not os.getenv('ODDS_API_KEY'):
+        logger.warning("ODDS_API_KEY is not set, saving odds without event IDs")
+        return final_df
+
+    sport_keys = {sport: SPORT_KEY_MAP[sport] for sport in final_df['Sport'].unique() if sport in SPORT_KEY_MAP}
+    with run_report.stage('events api'):
+        payloads = fetch_all_events(sport_keys)
+    events = pd.DataFrame([
+        {
+            'Sport': sport,
+            'Home Team': event['home_team'],
+            'Away Team': event['away_team'],
+            'Commence Time': commence_time_est(event.get('commence_time')),
+            'Event ID': event['id']
+        }
+        for sport, payload in payloads.items() if payload
+        for event in payload
+    ])
+    if events.empty:
+        logger.warning("No API events found, saving odds without event IDs")
+        return final_df
+
+    # Same team IDs and nearest kickoff as the results join
+    with run_report.stage('match events'):
+        positions = team_index.match_games(final_df, events)
+    final_df['Event ID'] = np.where(positions >= 0, events['Event ID'].to_numpy()[positions], None)
+    logger.info(f"Attached event IDs to {int((positions >= 0).sum())} of {len(final_df)} odds entries")
+    return final_df
+
+def saved_odds(date_str):
+    """The game_odds rows already saved for date_str, from the CSV or else the store; None if there are none."""
+    filename = f'data/game_odds_{date_str}.csv'
+    if os.path.exists(filename):
+        return pd.read_csv(filename)
+    if odds_store.available():
+        stored = odds_store.read_dataset('game_odds', date_str, date_str)
+        if not stored.empty:
+            return stored
+    return None
+
+def carry_event_ids(final_df, date_str):
+    """Copy 'Event ID' from date_str's saved odds onto re-parsed rows, by sport, teams and kickoff.
+
+    /events only lists upcoming games, so a past game's ID cannot be fetched again.
+    """
+    keys = ['Sport', 'Home Team', 'Away Team', 'Match Date']
+    final_df['Event ID'] = None
+    saved = saved_odds(date_str)
+    if saved is None or 'Event ID' not in saved.columns:
+        return final_df
+
+    saved = saved.dropna(subset=['Event ID'])
+    ids = saved[keys + ['Event ID']].assign(**{'Match Date': pd.to_datetime(saved['Match Date'], errors='coerce')})
+    ids = ids.drop_duplicates(keys)
+    games = final_df[keys].assign(**{'Match Date': pd.to_datetime(final_df['Match Date'], errors='coerce')})
+    # ids is unique on keys, so the left merge keeps final_df's rows in order
+    final_df['Event ID'] = games.merge(ids, on=keys, how='left')['Event ID'].to_numpy()
+    logger.info(f"Kept event IDs for {int(final_df['Event ID'].notna().sum())} of {len(final_df)} re-parsed entries")
+    return final_df
+
+def parse_sport_page(sport, html_content, target_date):
+    """process_sport_odds in a worker process; returns (cleaned_df, entries, run report parts)."""
+    report = run_report.start('parse worker')
+    entries = {}
+    cleaned_df = process_sport_odds(sport, html_content, target_date, entries)
+    return cleaned_df, entries, report.parts()
+
+def compile_odds(sports, target_date, est_tz, archive_date_str=None, validators=None, skip_unchanged=False,
+                 entries=None, parse_workers=None):
+    """Download, parse and clean every (sport, url) page; returns the combined odds or None.
+
+    With skip_unchanged, pages whose body is the same as in the last poll are not
+    parsed at all and their sports are left out of the result. Pages are parsed in
+    parse_workers processes (PARSE_WORKERS by default) while later ones download.
+    A page's new validators only replace the old ones once it has parsed, so a page
+    that came back truncated is downloaded in full on the next poll.
+    """
+    parse_workers = PARSE_WORKERS if parse_workers is None else parse_workers
+    # Spawned workers do not inherit the download threads' locks the way forked ones would
+    executor = None
+    if parse_workers > 1 and len(sports) > 1:
+        executor = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    # Parse and clean each page as soon as it arrives, then reassemble in file order
+    # so the output is identical to a sequential run
+    cleaned_by_index = {}
+    pending = {}
+    unchanged = 0
+    polled = dict(validators) if validators is not None else None
+    parsed = {}  # sport -> entries on its page, for every page that parsed
+    settled_urls = set()
+    try:
+        for i, html_content, changed in fetch_odds_pages(sports, validators=polled, need_body=not skip_unchanged):
+            sport, url = sports[i]
+            if skip_unchanged and not changed:
+                unchanged += 1
+                settled_urls.add(url)
+                continue
+            if html_content and archive_date_str:
+                fetched_at = datetime.now(est_tz).strftime('%Y-%m-%d %H:%M:%S')
+                with run_report.stage('archive'):
+                    html_archive.save_snapshot(sport, url, html_content, archive_date_str, fetched_at)
+            if executor is None:
+                cleaned_by_index[i] = process_sport_odds(sport, html_content, target_date, parsed)
+            else:
+                pending[executor.submit(parse_sport_page, sport, html_content, target_date)] = i
+
+        if pending:
+            with run_report.stage('parse wait'):
+                for future in as_completed(pending):
+                    cleaned_df, page_entries, parts = future.result()
+                    cleaned_by_index[pending[future]] = cleaned_df
+                    parsed.update(page_entries)
+                    run_report.merge(parts)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if entries is not None:
+        entries.update(parsed)
+    if validators is not None:
+        settled_urls.update(url for sport, url in sports if sport in parsed)
+        validators.update({url: polled[url] for url in settled_urls if url in polled})
+
+    if skip_unchanged:
+        logger.info(f"Skipped {unchanged} of {len(sports)} pages unchanged since the last poll")
+        run_report.count('pages unchanged', unchanged)
+    all_cleaned_data = [
+        cleaned_by_index[i] for i in sorted(cleaned_by_index)
+        if cleaned_by_index[i] is not None
+    ]
+    if not all_cleaned_data:
+        return None
+
+    final_df = pd.concat(all_cleaned_data, ignore_index=True)
+    # Add compilation timestamp in EST
+    final_df['Compiled_At'] = datetime.now(est_tz).strftime('%Y-%m-%d %H:%M:%S')
+    return final_df
+
+def save_odds_snapshot():
+    """Poll today's and tomorrow's lines and record only the prices that moved (see line_history.py)."""
+    est_tz = ZoneInfo('America/New_York')
+    today_est = datetime.now(est_tz).date()
+    target_dates = [today_est, today_est + timedelta(days=1)]
+
+    logger.info(f"Taking odds snapshot for {target_dates[0]} and {target_dates[1]} (EST)")
+    sports, _ = sport_activity.select_sports(load_sports(), today_est.strftime('%Y%m%d'))
+
+    # Unchanged pages carry no new prices, unless the dates being polled have rolled over
+    state = load_fetch_state('snapshot')
+    date_strs = [target_date.strftime('%Y%m%d') for target_date in target_dates]
+    skip_unchanged = state['dates'] == date_strs
+    final_df = compile_odds(sports, target_dates, est_tz, validators=state['pages'], skip_unchanged=skip_unchanged)
+    state['dates'] = date_strs
+    save_fetch_state('snapshot', state)
+    if final_df is None:
+        logger.warning("No changed games found for today or tomorrow (EST)")
+        return
+
+    game_dates = pd.to_datetime(final_df['Match Date']).dt.date
+    for target_date in target_dates:
+        day_df = final_df[game_dates == target_date]
+        if not day_df.empty:
+            date_str = target_date.strftime('%Y%m%d')
+            with run_report.stage('line history'):
+                deltas = line_history.record_snapshot(day_df, date_str)
+            run_report.count('lines changed', len(deltas))
+            # Scan the whole current board, not just the pages that changed in this poll
+            with run_report.stage('arbitrage'):
+                report = arbitrage.scan(line_history.odds_as_of(date_str))
+            run_report.count('arbitrage matches', int(report['Arbitrage'].sum()))
+            arbitrage_rows = report.loc[report['Arbitrage'], ['Sport', 'Home Team', 'Away Team', 'Arbitrage %']]
+            for sport, home, away, edge in arbitrage_rows.itertuples(index=False):
+                logger.info(f"Arbitrage {edge:.2f}% on {sport} {home} vs {away} ({date_str})")
+
+def write_daily_odds(final_df, date_str):
+    logger.info(f"Total compiled odds entries: {len(final_df)}")
+
+    filename = f'data/game_odds_{date_str}.csv'
+    with run_report.stage('write'):
+        final_df.to_csv(filename, index=False)
+    run_report.count('rows written', len(final_df))
+    logger.info(f"Odds data for {date_str} saved to {filename} (EST)")
+    with run_report.stage('store'):
+        odds_store.write_partition(final_df, 'game_odds', date_str)
+
+def reparse_archived_date(date_str, snapshots):
+    """Rebuild one day's odds from archived [(sport, sha256, fetched_at)] pages, in order."""
+    target_date = datetime.strptime(date_str, '%Y%m%d').date()
+    all_cleaned_data = []
+    for sport, sha256, _ in snapshots:
+        cleaned_df = process_sport_odds(sport, html_archive.load_snapshot(sha256), target_date)
+        if cleaned_df is not None:
+            all_cleaned_data.append(cleaned_df)
+
+    if not all_cleaned_data:
+        return date_str, None
+    final_df = pd.concat(all_cleaned_data, ignore_index=True)
+    # The day was compiled when its last page was fetched
+    final_df['Compiled_At'] = max(fetched_at for _, _, fetched_at in snapshots)
+    return date_str, final_df
+
+def save_odds_from_archive(start_date=None, end_date=None, workers=None):
+    """Re-parse archived pages for every target date in [start_date, end_date] without the network."""
+    index = html_archive.load_index()
+    dates = html_archive.archived_dates(start_date, end_date, index)
+    if not dates:
+        logger.warning(f"No archived pages between {start_date or 'the start'} and {end_date or 'the end'}")
+        return
+
+    # Keep sports_url.csv order so a re-parse matches the original run
+    sport_order = {sport: i for i, sport in enumerate(sport for sport, _ in load_sports())}
+    jobs = {}
+    for date_str in dates:
+        latest = html_archive.snapshots_for_date(date_str, index)
+        latest = latest.assign(order=latest['sport'].map(sport_order).fillna(len(sport_order)))
+        latest = latest.sort_values('order', kind='stable')
+        jobs[date_str] = list(zip(latest['sport'], latest['sha256'], latest['fetched_at']))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(reparse_archived_date, date_str, snapshots) for date_str, snapshots in jobs.items()]
+        for future in as_completed(futures):
+            date_str, final_df = future.result()
+            results[date_str] = final_df
+
+    # Outputs and the store are written from this process, in date order
+    for date_str in sorted(results):
+        if results[date_str] is None:
+            logger.warning(f"No games found in archived pages for {date_str}")
+            continue
+        write_daily_odds(carry_event_ids(results[date_str], date_str), date_str)
+    logger.info(f"Re-parsed {len(jobs)} archived day(s)")
+
+def main():
+    """Same as `python scripts/odds.py fetch ...`; the options are defined there."""
+    from odds import main as odds_main
+    odds_main(['fetch'] + sys.argv[1:])
 
 if __name__ == "__main__":
-    save_daily_odds() 
+    main() 
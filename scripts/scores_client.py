@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import datetime
+import pytz
+import requests
+from requests.adapters import HTTPAdapter
+
+import run_report
+from file_utils import atomic_write
+
+# ODDS_API_URL points the client at another host, e.g. scripts/mock_server.py
+API_BASE_URL = os.getenv('ODDS_API_URL', 'https://api.the-odds-api.com/v4').rstrip('/')
+SCORES_URL = API_BASE_URL + "/sports/{sport_key}/scores/"
+# Listing upcoming events does not count against the usage quota
+EVENTS_URL = API_BASE_URL + "/sports/{sport_key}/events/"
+
+# Fan-out tuning for the scores endpoint
+MAX_IN_FLIGHT = int(os.getenv('SCORES_MAX_IN_FLIGHT', '8'))
+REQUEST_TIMEOUT = float(os.getenv('SCORES_REQUEST_TIMEOUT', '15'))
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Response cache: entries whose games are all final never expire, others live for CACHE_TTL seconds.
+# SCORES_CACHE_ONLY=1 serves from the cache and never calls the API.
+CACHE_DIR = os.getenv('SCORES_CACHE_DIR', os.path.join('data', 'cache', 'scores'))
+CACHE_TTL = float(os.getenv('SCORES_CACHE_TTL', '900'))
+CACHE_ONLY = os.getenv('SCORES_CACHE_ONLY', '') not in ('', '0', 'false')
+
+QUOTA_HEADERS = ('x-requests-used', 'x-requests-remaining', 'x-requests-last')
+
+# Latest quota headers seen this run plus how many calls hit the API or the cache
+quota = {'requests': 0, 'cache_hits': 0}
+
+def backoff_delay(attempt, retry_after=None):
+    # Honour Retry-After when the API sends it, otherwise full-jitter exponential backoff
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def cache_path(sport_key, days_from, date_str):
+    key = json.dumps([sport_key, days_from, date_str])
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+def commence_time_est(commence):
+    """An API commence_time ('2025-03-01T00:10:00Z') as 'YYYY-MM-DD HH:MM:SS' New York time, or None."""
+    if not commence:
+        return None
+    started = datetime.fromisoformat(commence.replace('Z', '+00:00')).astimezone(pytz.timezone('America/New_York'))
+    return started.strftime('%Y-%m-%d %H:%M:%S')
+
+def games_final(payload, date_str):
+    # Only games that started on or before date_str have to be completed for the entry to be final
+    for game in payload:
+        started = commence_time_est(game.get('commence_time'))
+        if started and started[:10].replace('-', '') > date_str:
+            continue
+        if not game.get('completed'):
+            return False
+    return True
+
+def read_cache(sport_key, days_from, date_str, cache_only=False):
+    # Any daysFrom window stored for this date covers it, so fall back to the other ones
+    for window in [days_from] + [d for d in range(1, 4) if d != days_from]:
+        path = cache_path(sport_key, window, date_str)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        if cache_only or entry['final'] or time.time() - entry['fetched_at'] < CACHE_TTL:
+            return entry['payload']
+    return None
+
+def has_cache(sport_key, date_str):
+    """Whether date_str's scores for sport_key are cached under any daysFrom window."""
+    return any(os.path.exists(cache_path(sport_key, window, date_str)) for window in range(1, 4))
+
+def write_cache(sport_key, days_from, date_str, payload):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry = {
+        'key': {'sport_key': sport_key, 'days_from': days_from, 'date': date_str},
+        'fetched_at': time.time(),
+        'final': games_final(payload, date_str),
+        'payload': payload
+    }
+    with atomic_write(cache_path(sport_key, days_from, date_str), encoding='utf-8') as f:
+        json.dump(entry, f)
+
+def record_quota(sport, response):
+    quota['requests'] += 1
+    run_report.count('api requests')
+    headers = {name: response.headers.get(name) for name in QUOTA_HEADERS if name in response.headers}
+    if headers:
+        quota.update(headers)
+        for name, value in headers.items():
+            run_report.set_value(name, value)
+        try:
+            run_report.count('api quota used', float(headers.get('x-requests-last', 0)))
+        except ValueError:
+            pass
+        print(f"Fetched {sport}: used {headers.get('x-requests-used')}, "
+              f"remaining {headers.get('x-requests-remaining')}, cost {headers.get('x-requests-last')}")
+
+async def fetch_scores(session, semaphore, sport, sport_key, days_from=1, date_str=None, cache_only=False):
+    cached = read_cache(sport_key, days_from, date_str, cache_only)
+    if cached is not None:
+        quota['cache_hits'] += 1
+        run_report.count('api cache hits')
+        return cached
+    if cache_only:
+        print(f"No cached results for {sport} ({sport_key}, daysFrom={days_from}, {date_str})")
+        return None
+
+    params = {
+        'apiKey': os.getenv('ODDS_API_KEY'),
+        'daysFrom': days_from
+    }
+    payload = await request_json(session, semaphore, sport, SCORES_URL.format(sport_key=sport_key), params)
+    if payload is not None:
+        write_cache(sport_key, days_from, date_str, payload)
+    return payload
+
+async def fetch_events(session, semaphore, sport, sport_key):
+    params = {'apiKey': os.getenv('ODDS_API_KEY')}
+    return await request_json(session, semaphore, sport, EVENTS_URL.format(sport_key=sport_key), params, 'events')
+
+async def request_json(session, semaphore, sport, url, params, what='results'):
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
+        async with semaphore:
+            try:
+                response = await asyncio.to_thread(
+                    session.get, url, params=params, timeout=REQUEST_TIMEOUT
+                )
+                record_quota(sport, response)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get('Retry-After')
+                error = f"HTTP {response.status_code}"
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = e
+            except Exception as e:
+                print(f"Error fetching {what} for {sport}: {e}")
+                return None
+
+        if attempt == MAX_RETRIES:
+            print(f"Error fetching {what} for {sport}: {error} (gave up after {attempt + 1} attempts)")
+            return None
+
+        delay = backoff_delay(attempt, retry_after)
+        print(f"Retrying {sport} in {delay:.1f}s after {error}")
+        await asyncio.sleep(delay)
+
+async def _fetch_all(fetch, sport_keys, max_in_flight, *args):
+    semaphore = asyncio.Semaphore(max_in_flight)
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        sports = list(sport_keys)
+        results = await asyncio.gather(*(
+            fetch(session, semaphore, sport, sport_keys[sport], *args)
+            for sport in sports
+        ))
+    return dict(zip(sports, results))
+
+def fetch_all_scores(sport_keys, days_from=1, max_in_flight=MAX_IN_FLIGHT, date_str=None, cache_only=None):
+    """Fetch /scores/ for every {sport: api_key} pair at once; failed sports map to None.
+
+    date_str (YYYYMMDD, default today in New York) is the day the scores are for and
+    part of the cache key together with the sport key and daysFrom.
+    """
+    if not sport_keys:
+        return {}
+    date_str = date_str or datetime.now(pytz.timezone('America/New_York')).strftime('%Y%m%d')
+    cache_only = CACHE_ONLY if cache_only is None else cache_only
+
+    requests_before, hits_before = quota['requests'], quota['cache_hits']
+    results = asyncio.run(_fetch_all(fetch_scores, sport_keys, max_in_flight, days_from, date_str, cache_only))
+    print(f"Scores: {quota['requests'] - requests_before} API requests, "
+          f"{quota['cache_hits'] - hits_before} cache hits, "
+          f"quota remaining {quota.get('x-requests-remaining', 'unknown')}")
+    return results
+
+def fetch_all_events(sport_keys, max_in_flight=MAX_IN_FLIGHT):
+    """Fetch /events/ (id, commence_time, teams) for every {sport: api_key} pair; failed sports map to None."""
+    if not sport_keys:
+        return {}
+    return asyncio.run(_fetch_all(fetch_events, sport_keys, max_in_flight))
+
+def fetch_game_results(sport, sport_url, days_from=1):
+    return fetch_all_scores({sport: sport_url}, days_from).get(sport)
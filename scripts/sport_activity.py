@@ -0,0 +1,160 @@
+"""Per-sport activity index used to poll off-season leagues less often.
+
+data/sport_activity.csv keeps one row per sport with the last date it had games,
+the last date its page listed any entries, the last date it was polled, the months
+it has had games in and the months it has been polled in. A sport is polled on
+every run when it is active or in season, and every OFFSEASON_INTERVAL_DAYS otherwise:
+
+- active: games or listed entries within the last ACTIVE_DAYS days
+- in season: this month or next month has had games, or this month has never been polled
+
+Usage:
+    python scripts/sport_activity.py            # show the index and today's decisions
+    python scripts/sport_activity.py rebuild    # rebuild from data/game_odds_*.csv
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import pandas as pd
+
+from file_utils import atomic_write
+from sports import load_sports
+
+ACTIVITY_FILE = 'data/sport_activity.csv'
+ACTIVE_DAYS = int(os.getenv('ODDS_ACTIVE_DAYS', '14'))
+OFFSEASON_INTERVAL_DAYS = int(os.getenv('ODDS_OFFSEASON_INTERVAL_DAYS', '7'))
+# ODDS_POLL_ALL=1 ignores the index and polls every sport
+POLL_ALL = os.getenv('ODDS_POLL_ALL', '') not in ('', '0', 'false')
+
+COLUMNS = ['Sport', 'Last Games', 'Last Entries', 'Last Checked', 'Season Months', 'Checked Months']
+
+def parse_months(value):
+    return {int(month) for month in str(value).split()} if pd.notna(value) and str(value).strip() else set()
+
+def format_months(months):
+    return ' '.join(str(month) for month in sorted(months))
+
+def load_index(path=ACTIVITY_FILE):
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    index = {}
+    for row in df.to_dict('records'):
+        index[row['Sport']] = {
+            'Last Games': row['Last Games'],
+            'Last Entries': row['Last Entries'],
+            'Last Checked': row['Last Checked'],
+            'Season Months': parse_months(row['Season Months']),
+            'Checked Months': parse_months(row['Checked Months'])
+        }
+    return index
+
+def save_index(index, path=ACTIVITY_FILE):
+    rows = [
+        dict(entry, Sport=sport,
+             **{'Season Months': format_months(entry['Season Months']),
+                'Checked Months': format_months(entry['Checked Months'])})
+        for sport, entry in sorted(index.items())
+    ]
+    with atomic_write(path) as f:
+        pd.DataFrame(rows, columns=COLUMNS).to_csv(f, index=False)
+
+def days_between(earlier, later):
+    if not earlier:
+        return None
+    return (datetime.strptime(later, '%Y%m%d') - datetime.strptime(earlier, '%Y%m%d')).days
+
+def poll_reason(entry, date_str):
+    """Why a sport should be polled on date_str, or None to skip it this run."""
+    if entry is None:
+        return 'new sport'
+    for column in ('Last Games', 'Last Entries'):
+        age = days_between(entry[column], date_str)
+        if age is not None and age <= ACTIVE_DAYS:
+            return 'active'
+
+    month = int(date_str[4:6])
+    next_month = month % 12 + 1
+    if month in entry['Season Months'] or next_month in entry['Season Months']:
+        return 'in season'
+    if month not in entry['Checked Months']:
+        return 'no history for this month'
+
+    age = days_between(entry['Last Checked'], date_str)
+    if age is None or age >= OFFSEASON_INTERVAL_DAYS:
+        return 'weekly off-season check'
+    return None
+
+def select_sports(sports, date_str, index=None):
+    """Split [(sport, url)] into the ones to poll on date_str and the sports skipped."""
+    if POLL_ALL:
+        return list(sports), []
+    index = load_index() if index is None else index
+    polled, skipped = [], []
+    for sport, url in sports:
+        if poll_reason(index.get(sport), date_str):
+            polled.append((sport, url))
+        else:
+            skipped.append(sport)
+    return polled, skipped
+
+def record_poll(index, date_str, polled_sports, entries, game_sports):
+    """Update index after polling polled_sports on date_str.
+
+    entries maps sport -> number of listed entries on its page (any date) and
+    game_sports are the sports that produced cleaned games for the run.
+    """
+    month = int(date_str[4:6])
+    for sport in polled_sports:
+        entry = index.setdefault(sport, {
+            'Last Games': '', 'Last Entries': '', 'Last Checked': '',
+            'Season Months': set(), 'Checked Months': set()
+        })
+        if sport not in entries:
+            # The download failed; nothing was learned about this sport
+            continue
+        entry['Last Checked'] = date_str
+        entry['Checked Months'].add(month)
+        if entries[sport]:
+            entry['Last Entries'] = date_str
+        if sport in game_sports:
+            entry['Last Games'] = date_str
+            entry['Season Months'].add(month)
+    return index
+
+def rebuild(data_dir='data', path=ACTIVITY_FILE):
+    """Rebuild the index from the daily odds files; every sport was polled on every one of those days."""
+    import data_loader
+
+    sports = [sport for sport, _ in load_sports(os.path.join(data_dir, 'sports_url.csv'))]
+    odds = data_loader.load_dataset('game_odds', data_dir=data_dir)
+    sports_by_date = odds.groupby('date', observed=True)['Sport'].unique() if not odds.empty else {}
+    index = {}
+    # Days whose file has no games were still polled
+    for date_str, _ in data_loader.dataset_files('game_odds', data_dir=data_dir):
+        game_sports = set(sports_by_date.get(date_str, []))
+        record_poll(index, date_str, sports, {sport: int(sport in game_sports) for sport in sports}, game_sports)
+    save_index(index, path)
+    print(f"Rebuilt activity index for {len(index)} sports into {path}")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-sport activity index')
+    parser.add_argument('command', nargs='?', choices=['show', 'rebuild'], default='show')
+    parser.add_argument('--date', help='Date to evaluate (YYYYMMDD), defaults to tomorrow')
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        rebuild()
+        return
+
+    tomorrow = datetime.now(ZoneInfo('America/New_York')) + timedelta(days=1)
+    date_str = args.date or tomorrow.strftime('%Y%m%d')
+    index = load_index()
+    for sport, _ in load_sports():
+        reason = poll_reason(index.get(sport), date_str)
+        print(f"{sport:<40} {reason or 'skip'}")
+
+if __name__ == "__main__":
+    main()
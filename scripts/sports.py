@@ -0,0 +1,124 @@
+"""Shared sports registry used by every stage.
+
+The odds site's sport pages come from data/sports_url.csv; SPORT_KEY_MAP maps those
+sport names to the-odds-api keys for results, and DRAW_SPORTS lists the three-way
+markets. This module only uses the standard library so any command can import it cheaply.
+"""
+import csv
+import os
+
+SPORTS_URL_FILE = os.path.join('data', 'sports_url.csv')
+
+# Odds-site sport name -> the-odds-api sport key
+SPORT_KEY_MAP = {
+    'NFL': 'americanfootball_nfl',
+    'NCAAF': 'americanfootball_ncaaf',
+    'CFL': 'americanfootball_cfl',
+    'UFL': 'americanfootball_ufl',
+    'AFL': 'aussierules_afl',
+    'MLB': 'baseball_mlb',
+    'Basketball Euroleague': 'basketball_euroleague',
+    'NBA': 'basketball_nba',
+    'WNBA': 'basketball_wnba',
+    'NCAAB': 'basketball_ncaab',
+    'WNCAAB': 'basketball_wncaab',
+    'NBL': 'basketball_nbl',
+    'Boxing': 'boxing_boxing',
+    'Big Bash': 'cricket_big_bash',
+    'Test Matches': 'cricket_test_match',
+    'NHL': 'icehockey_nhl',
+    'SHL': 'icehockey_sweden_hockey_league',
+    'MMA': 'mma_mixed_martial_arts',
+    'NRL': 'rugbyleague_nrl',
+    'Primera División - Argentina': 'soccer_argentina_primera_division',
+    'A-League': 'soccer_australia_aleague',
+    'Austrian Football Bundesliga': 'soccer_austria_bundesliga',
+    'Belgium First Div': 'soccer_belgium_first_div',
+    'Brazil Série A': 'soccer_brazil_campeonato',
+    'Brazil Série B': 'soccer_brazil_serie_b',
+    'Primera División - Chile': 'soccer_chile_campeonato',
+    'Super League - China': 'soccer_china_superleague',
+    'Denmark Superliga': 'soccer_denmark_superliga',
+    'Championship': 'soccer_efl_champ',
+    'EFL Cup': 'soccer_england_efl_cup',
+    'League 1': 'soccer_england_league1',
+    'League 2': 'soccer_england_league2',
+    'EPL': 'soccer_epl',
+    'FA Cup': 'soccer_fa_cup',
+    'FIFA World Cup': 'soccer_fifa_world_cup',
+    'Veikkausliiga - Finland': 'soccer_finland_veikkausliiga',
+    'Ligue 1 - France': 'soccer_france_ligue_one',
+    'Ligue 2 - France': 'soccer_france_ligue_two',
+    'Bundesliga - Germany': 'soccer_germany_bundesliga',
+    'Bundesliga 2 - Germany': 'soccer_germany_bundesliga2',
+    '3. Liga - Germany': 'soccer_germany_liga3',
+    'Super League - Greece': 'soccer_greece_super_league',
+    'Serie A - Italy': 'soccer_italy_serie_a',
+    'Serie B - Italy': 'soccer_italy_serie_b',
+    'J League': 'soccer_japan_j_league',
+    'K League 1': 'soccer_korea_kleague1',
+    'League of Ireland': 'soccer_league_of_ireland',
+    'Liga MX': 'soccer_mexico_ligamx',
+    'Dutch Eredivisie': 'soccer_netherlands_eredivisie',
+    'Eliteserien - Norway': 'soccer_norway_eliteserien',
+    'Ekstraklasa - Poland': 'soccer_poland_ekstraklasa',
+    'Primeira Liga - Portugal': 'soccer_portugal_primeira_liga',
+    'La Liga - Spain': 'soccer_spain_la_liga',
+    'La Liga 2 - Spain': 'soccer_spain_segunda_division',
+    'Premiership - Scotland': 'soccer_spl',
+    'Allsvenskan - Sweden': 'soccer_sweden_allsvenskan',
+    'Superettan - Sweden': 'soccer_sweden_superettan',
+    'Swiss Superleague': 'soccer_switzerland_superleague',
+    'Turkey Super League': 'soccer_turkey_super_league',
+    'UEFA Europa Conference League': 'soccer_uefa_europa_conference_league',
+    'UEFA Champions League': 'soccer_uefa_champs_league',
+    'UEFA Champions League Qualification': 'soccer_uefa_champs_league_qualification',
+    'UEFA Europa League': 'soccer_uefa_europa_league',
+    'UEFA Euro 2024': 'soccer_uefa_european_championship',
+    'UEFA Euro Qualification': 'soccer_uefa_euro_qualification',
+    'Copa América': 'soccer_conmebol_copa_america',
+    'Copa Libertadores': 'soccer_conmebol_copa_libertadores',
+    'MLS': 'soccer_usa_mls',
+    'ATP Australian Open': 'tennis_atp_aus_open_singles',
+    'ATP Canadian Open': 'tennis_atp_canadian_open',
+    'ATP China Open': 'tennis_atp_china_open',
+    'ATP Cincinnati Open': 'tennis_atp_cincinnati_open',
+    'ATP French Open': 'tennis_atp_french_open',
+    'ATP Paris Masters': 'tennis_atp_paris_masters',
+    'ATP Shanghai Masters': 'tennis_atp_shanghai_masters',
+    'ATP US Open': 'tennis_atp_us_open',
+    'ATP Wimbledon': 'tennis_atp_wimbledon',
+    'WTA Australian Open': 'tennis_wta_aus_open_singles',
+    'WTA Canadian Open': 'tennis_wta_canadian_open',
+    'WTA China Open': 'tennis_wta_china_open',
+    'WTA Cincinnati Open': 'tennis_wta_cincinnati_open',
+    'WTA French Open': 'tennis_wta_french_open',
+    'WTA US Open': 'tennis_wta_us_open',
+    'WTA Wimbledon': 'tennis_wta_wimbledon',
+    'WTA Wuhan Open': 'tennis_wta_wuhan_open'
+}
+
+# Sports whose moneyline markets include a draw outcome
+DRAW_SPORTS = {
+    'Primera División - Argentina', 'A-League', 'Austrian Football Bundesliga',
+    'Belgium First Div', 'Copa Libertadores', 'Denmark Superliga', 'Championship',
+    'EFL Cup', 'League 1', 'League 2', 'EPL', 'FA Cup', 'Ligue 1 - France',
+    'Ligue 2 - France', 'Bundesliga - Germany', 'Bundesliga 2 - Germany',
+    '3. Liga - Germany', 'Super League - Greece', 'Serie A - Italy',
+    'Serie B - Italy', 'League of Ireland', 'Liga MX', 'Dutch Eredivisie',
+    'Primeira Liga - Portugal', 'La Liga - Spain', 'La Liga 2 - Spain',
+    'Premiership - Scotland', 'Swiss Superleague', 'Turkey Super League',
+    'UEFA Champions League', 'UEFA Europa Conference League', 'UEFA Europa League'
+}
+
+def load_sports(path=SPORTS_URL_FILE):
+    """[(sport, odds page URL)] in sports_url.csv order."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(row['Sport'], row['URL']) for row in csv.DictReader(f)]
+
+def canonical_sport_names(path=SPORTS_URL_FILE):
+    """{lowercased sport name: registry spelling}, for files written before names were case-stable."""
+    names = list(SPORT_KEY_MAP)
+    if os.path.exists(path):
+        names += [sport for sport, _ in load_sports(path)]
+    return {name.lower(): name for name in names}
@@ -1,13 +1,97 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 import pytz
 
-def sync_data():
+import leaderboard
+import odds_store
+import run_report
+import team_index
+from file_utils import atomic_write
+
+def match_results(odds_df, results_df, by=None):
+    """Row position in results_df of each odds row's game, -1 where it has no result.
+
+    Odds saved with an API event ID join on results' Game ID in one hash lookup; the
+    rest pair up on team IDs with the nearest kickoff time (see team_index.match_games),
+    so a doubleheader never multiplies rows. by adds key columns such as ['date'].
+    """
+    positions = np.full(len(odds_df), -1, dtype=np.int64)
+    if 'Event ID' in odds_df.columns and 'Game ID' in results_df.columns:
+        by_game_id = pd.Series(np.arange(len(results_df)), index=results_df['Game ID'].to_numpy())
+        by_game_id = by_game_id[~by_game_id.index.duplicated() & by_game_id.index.notna()]
+        positions = by_game_id.reindex(odds_df['Event ID'].to_numpy()).fillna(-1).to_numpy(dtype=np.int64, copy=True)
+
+    unmatched = positions < 0
+    if unmatched.any() and len(results_df):
+        positions[unmatched] = team_index.match_games(odds_df[unmatched], results_df, by=by)
+    return positions
+
+def build_performance(odds_df, results_df):
+    """Merge one day's odds with its results; returns (bookmaker stats, merged rows)."""
+    # Pair every odds row with its result and lay the rows out as a merge on the names would
+    positions = match_results(odds_df, results_df)
+    odds_columns = ['Match Date', 'Home Team Odds', 'Away Team Odds', 'Bookmaker', 'Compiled_At']
+    if 'Event ID' in odds_df.columns:
+        odds_columns.append('Event ID')
+    odds_df = odds_df.reset_index(drop=True)
+    merged_df = pd.concat([
+        results_df.reset_index(drop=True).reindex(positions).reset_index(drop=True),
+        odds_df[odds_columns].rename(columns={'Match Date': 'Match Date_time'})
+    ], axis=1)
+    # Games without results keep the odds site's names
+    for column in ('Sport', 'Home Team', 'Away Team'):
+        merged_df[column] = merged_df[column].fillna(odds_df[column])
+    merged_df = merged_df.sort_values(['Sport', 'Home Team', 'Away Team'], kind='stable', ignore_index=True)
+    
+    # Drop rows without odds
+    merged_df = merged_df.dropna(subset=['Home Team Odds', 'Away Team Odds'])
+    
+    # Determine favorites (lower odds) and actual winners for every row at once
+    home_score = merged_df['Home Score']
+    away_score = merged_df['Away Score']
+    favorite = np.where(merged_df['Home Team Odds'] < merged_df['Away Team Odds'], 'Home', 'Away')
+    winner = np.select([home_score > away_score, away_score > home_score], ['Home', 'Away'], 'Draw')
+    completed = merged_df['Status'] == 'Completed'
+    
+    # Calculate win percentages and unknown games for each bookmaker in one pass
+    counts = pd.DataFrame({
+        'Bookmaker': merged_df['Bookmaker'],
+        'Completed': completed,
+        'Unknown Games': merged_df['Status'] == 'Unknown',
+        'Favorite Wins': completed & (favorite == winner)
+    }).groupby('Bookmaker', sort=False).sum()
+    counts = counts[counts['Completed'] > 0]
+    
+    if counts.empty:
+        stats_df = pd.DataFrame()
+    else:
+        completed_games = counts['Completed']
+        underdog_wins = completed_games - counts['Favorite Wins']
+        stats_df = pd.DataFrame({
+            'Bookmaker': counts.index,
+            'Underdog Wins': underdog_wins.to_numpy(),
+            'Underdog Win %': (underdog_wins / completed_games * 100).round(2).to_numpy(),
+            'Favorite Wins': counts['Favorite Wins'].to_numpy(),
+            'Favorite Win %': (counts['Favorite Wins'] / completed_games * 100).round(2).to_numpy(),
+            'Unknown Games': counts['Unknown Games'].to_numpy()
+        })
+    
+    return stats_df, merged_df
+
+def write_performance(output_file, stats_df, merged_df):
+    # Save merged data with stats at the top
+    with atomic_write(output_file) as f:
+        stats_df.to_csv(f, index=False)
+        f.write('\n')  # Add blank line between tables
+        merged_df.to_csv(f, index=False)
+
+def sync_data(date_str=None):
     try:
         # Get today's date
         ny_tz = pytz.timezone('America/New_York')
-        today = datetime.now(ny_tz).strftime('%Y%m%d')
+        today = date_str or datetime.now(ny_tz).strftime('%Y%m%d')
       
         # Required files
         # Get yesterday's date for odds file
@@ -20,70 +104,25 @@ def sync_data():
             return False
         
         # Read the files
-        odds_df = pd.read_csv(odds_file)
-        results_df = pd.read_csv(results_file)
-        
-        # Merge odds data with results on Sport, Home Team, Away Team
-        merged_df = pd.merge(
-            results_df,
-            odds_df[['Sport', 'Match Date', 'Home Team', 'Away Team', 'Home Team Odds', 'Away Team Odds', 'Bookmaker', 'Compiled_At']],
-            on=['Sport', 'Home Team', 'Away Team'],
-            how='outer',
-            suffixes=('', '_time')
-        )
-        
-        # Drop rows without odds
-        merged_df = merged_df.dropna(subset=['Home Team Odds', 'Away Team Odds'])
-        
-        # Calculate win percentages for each bookmaker
-        bookmaker_stats = []
-        for bookmaker in merged_df['Bookmaker'].unique():
-            bookmaker_df = merged_df[merged_df['Bookmaker'] == bookmaker]
-            
-            # Determine favorites and underdogs based on odds
-            bookmaker_df['Favorite'] = bookmaker_df.apply(
-                lambda x: 'Home' if x['Home Team Odds'] < x['Away Team Odds'] else 'Away', axis=1
-            )
-            
-            # Calculate actual winners
-            bookmaker_df['Winner'] = bookmaker_df.apply(
-                lambda x: 'Home' if x['Home Score'] > x['Away Score'] 
-                else 'Away' if x['Away Score'] > x['Home Score']
-                else 'Draw', axis=1
-            )
-            
-            # Calculate win percentages and unknown games
-            total_games = bookmaker_df.shape[0]
-            completed_games = bookmaker_df[bookmaker_df['Status'] == 'Completed'].shape[0]
-            unknown_games = bookmaker_df[bookmaker_df['Status'] == 'Unknown'].shape[0]
-            
-            if completed_games > 0:
-                favorite_wins = bookmaker_df[
-                    (bookmaker_df['Status'] == 'Completed') & 
-                    (bookmaker_df['Favorite'] == bookmaker_df['Winner'])
-                ].shape[0]
-                underdog_wins = completed_games - favorite_wins
-                
-                bookmaker_stats.append({
-                    'Bookmaker': bookmaker,
-                    'Underdog Wins': underdog_wins,
-                    'Underdog Win %': round(underdog_wins / completed_games * 100, 2),
-                    'Favorite Wins': favorite_wins,
-                    'Favorite Win %': round(favorite_wins / completed_games * 100, 2),
-                    'Unknown Games': unknown_games
-                })
+        with run_report.stage('read'):
+            odds_df = pd.read_csv(odds_file)
+            results_df = pd.read_csv(results_file)
+        run_report.count('odds rows in', len(odds_df))
+        run_report.count('results rows in', len(results_df))
         
-        # Create stats DataFrame
-        stats_df = pd.DataFrame(bookmaker_stats)
+        with run_report.stage('merge'):
+            stats_df, merged_df = build_performance(odds_df, results_df)
+        run_report.count('rows out', len(merged_df))
         
-        # Save merged data with stats at the top
         output_file = f'data/sportsbook_performance_{today}.csv'
-        with open(output_file, 'w') as f:
-            stats_df.to_csv(f, index=False)
-            f.write('\n')  # Add blank line between tables
-            merged_df.to_csv(f, index=False)
+        with run_report.stage('write'):
+            write_performance(output_file, stats_df, merged_df)
             
         print(f"Synced results saved to {output_file}")
+        with run_report.stage('store'):
+            odds_store.write_partition(merged_df, 'sportsbook_performance', today)
+        with run_report.stage('leaderboard'):
+            leaderboard.update_leaderboard(merged_df, today)
         return True
             
     except Exception as e:
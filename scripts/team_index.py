@@ -0,0 +1,322 @@
+"""Team-name alias index shared by the odds/results joins.
+
+The odds site and the-odds-api do not always spell a team the same way, so every
+observed spelling is mapped to an integer team ID per sport in data/team_aliases.csv.
+Joins then run on (Sport, Home Team ID, Away Team ID) instead of raw strings.
+
+At run time a spelling only matches a team when it is a known alias or equal after
+normalization (case, accents, punctuation, '&' vs 'and'); names that merely look
+alike ('Real Madrid' and 'Real Madrid B') stay apart. Other spellings are learned
+offline by rebuild, from games both sources list: the odds site's game and the
+API's game (scores cache, results files and the API games results.py could not
+match, logged in data/unmatched_games.csv) are the same when the odds row carries
+the API event ID, or when they share a day and one team and start within
+MATCH_WINDOW_HOURS of each other; the other team's two spellings then become aliases.
+Without kickoff times, two games that share a day and one team and that neither
+side could match by name are paired when the other team's spellings are at least
+ALIAS_CUTOFF alike (difflib), which is only safe with the opponent and day agreeing.
+
+IDs follow (Sport, canonical name) order, so sorting on IDs orders rows the same
+way sorting on the names does. Spellings first seen at run time get a new ID and
+are kept in memory; rebuild the file to persist them:
+    python scripts/team_index.py rebuild
+    python scripts/team_index.py lookup NBA "Boston Celtics" "boston celtics"
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+import data_loader
+import scores_client
+from file_utils import atomic_write
+from sports import SPORT_KEY_MAP
+
+ALIASES_FILE = 'data/team_aliases.csv'
+# API games with no odds game of the same names, kept so rebuild can learn their spellings
+UNMATCHED_FILE = 'data/unmatched_games.csv'
+UNMATCHED_COLUMNS = ['date', 'Sport', 'Home Team', 'Away Team', 'Commence Time', 'Game ID']
+# Minimum difflib ratio for the offline pairing of games without kickoff times
+ALIAS_CUTOFF = 0.7
+# Two listings of the same teams further apart than this are different games
+MATCH_WINDOW_HOURS = 12
+
+def normalize_name(name):
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    text = text.casefold().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+class TeamIndex:
+    """(sport, spelling) -> integer team ID lookup."""
+
+    def __init__(self):
+        self.ids = {}                      # (sport, normalized spelling) -> team ID
+        self.aliases = {}                  # (sport, spelling) -> team ID, as stored on disk
+        self.names = {}                    # team ID -> canonical spelling
+        self.next_id = 0
+
+    def add(self, sport, name, team_id=None):
+        if team_id is None:
+            team_id = self.next_id
+            self.names[team_id] = name
+        self.next_id = max(self.next_id, team_id + 1)
+        self.aliases[(sport, name)] = team_id
+        self.ids.setdefault((sport, normalize_name(name)), team_id)
+        return team_id
+
+    def match(self, sport, name):
+        """Existing team ID for a spelling, or None."""
+        team_id = self.aliases.get((sport, name))
+        if team_id is not None:
+            return team_id
+        return self.ids.get((sport, normalize_name(name)))
+
+    def lookup(self, sport, name):
+        """Team ID for a spelling, giving unseen teams a new ID."""
+        team_id = self.match(sport, name)
+        return self.add(sport, name, team_id)
+
+    def team_ids(self, sports, names):
+        # Resolve each distinct (sport, spelling) once
+        pairs = pd.MultiIndex.from_arrays([pd.Series(sports).astype(str), pd.Series(names).astype(str)])
+        codes, uniques = pd.factorize(pairs)
+        resolved = np.array([self.lookup(sport, name) for sport, name in uniques], dtype=np.int64)
+        return resolved[codes]
+
+    def add_team_ids(self, df):
+        """Copy of df with 'Home Team ID' and 'Away Team ID' columns."""
+        df = df.copy()
+        df['Home Team ID'] = self.team_ids(df['Sport'], df['Home Team'])
+        df['Away Team ID'] = self.team_ids(df['Sport'], df['Away Team'])
+        return df
+
+    def to_frame(self):
+        rows = [(sport, alias, team_id, self.names[team_id]) for (sport, alias), team_id in self.aliases.items()]
+        frame = pd.DataFrame(rows, columns=['Sport', 'Alias', 'Team ID', 'Team'])
+        return frame.sort_values(['Team ID', 'Alias'], kind='stable')
+
+def load_index(path=ALIASES_FILE):
+    index = TeamIndex()
+    if not os.path.exists(path):
+        return index
+    aliases = pd.read_csv(path, keep_default_na=False)
+    for sport, alias, team_id, team in aliases.itertuples(index=False):
+        index.names[team_id] = team
+        index.add(sport, alias, team_id)
+    return index
+
+_index = None
+
+def get_index():
+    """The alias index, loaded once per process."""
+    global _index
+    if _index is None:
+        _index = load_index()
+    return _index
+
+def match_games(left, right, left_time='Match Date', right_time='Commence Time', max_hours=MATCH_WINDOW_HOURS,
+                by=None):
+    """Position in right of the game each left row belongs to, -1 where there is none.
+
+    Rows pair up on (Sport, Home Team ID, Away Team ID) plus any extra key columns in
+    by (e.g. ['date'] to match many days at once). When the same teams appear
+    more than once (doubleheaders, series) the right row nearest in time wins, and
+    pairs more than max_hours apart are rejected. Where either side has no time, the
+    n-th left game (by time) takes the n-th right row of its teams (by time, then
+    order), so a second game without a counterpart stays unmatched.
+    """
+    index = get_index()
+    by = list(by or [])
+    keys = by + ['Sport', 'Home Team ID', 'Away Team ID']
+
+    def keyed(df, time_column, position):
+        times = df[time_column] if time_column in df.columns else pd.Series(pd.NaT, index=df.index)
+        return pd.DataFrame({
+            **{column: df[column].to_numpy() for column in by},
+            'Sport': df['Sport'].astype(str).to_numpy(),
+            'Home Team ID': index.team_ids(df['Sport'], df['Home Team']),
+            'Away Team ID': index.team_ids(df['Sport'], df['Away Team']),
+            position: np.arange(len(df)),
+            f'{position} time': pd.to_datetime(times, errors='coerce').to_numpy()
+        })
+
+    left_keyed = keyed(left, left_time, 'left')
+    right_keyed = keyed(right, right_time, 'right')
+    # Every row of a left game shares its time; rows without one count as a single game
+    left_keyed['game'] = left_keyed.groupby(keys, dropna=False)['left time'].rank(method='dense').fillna(1) - 1
+    right_keyed = right_keyed.sort_values('right time', kind='stable', na_position='last')
+    right_keyed['game'] = right_keyed.groupby(keys, dropna=False).cumcount()
+
+    pairs = left_keyed.merge(right_keyed, on=keys, suffixes=('', ' right'))
+    gap = (pairs['left time'] - pairs['right time']).abs()
+    pairs = pairs.assign(gap=gap)[~(gap > pd.Timedelta(hours=max_hours))]
+    pairs = pairs[pairs['gap'].notna() | (pairs['game'] == pairs['game right'])]
+    pairs = pairs.sort_values('gap', kind='stable', na_position='last').drop_duplicates('left')
+
+    matched = np.full(len(left), -1, dtype=np.int64)
+    matched[pairs['left'].to_numpy()] = pairs['right'].to_numpy()
+    return matched
+
+def observed_names(data_dir='data'):
+    """(Sport, spelling) -> number of games it appears in across the odds and results files."""
+    frames = []
+    for dataset in ('game_odds', 'game_results'):
+        games = data_loader.load_dataset(dataset, data_dir=data_dir)
+        if games.empty:
+            continue
+        games = games[['date', 'Sport', 'Home Team', 'Away Team']].drop_duplicates()
+        for column in ('Home Team', 'Away Team'):
+            frames.append(games[['Sport', column]].dropna().astype(str).set_axis(['Sport', 'Name'], axis=1))
+    names = pd.concat(frames, ignore_index=True)
+    return names.groupby(['Sport', 'Name']).size()
+
+def record_unmatched(date_str, games, path=UNMATCHED_FILE):
+    """Replace date_str's rows in the unmatched-games log with games, rows of UNMATCHED_COLUMNS without 'date'."""
+    log = pd.read_csv(path, dtype=str) if os.path.exists(path) else pd.DataFrame(columns=UNMATCHED_COLUMNS)
+    day = pd.DataFrame(games, columns=UNMATCHED_COLUMNS[1:]).assign(date=date_str)[UNMATCHED_COLUMNS]
+    frames = [frame for frame in (log[log['date'] != date_str], day) if not frame.empty]
+    log = pd.concat(frames, ignore_index=True) if frames else log
+    log = log.sort_values(['date', 'Sport', 'Home Team'], kind='stable')
+    with atomic_write(path) as f:
+        log.to_csv(f, index=False)
+    return len(day)
+
+def odds_games(data_dir='data'):
+    """One row per game in the odds files: date, Sport, teams, Match Date and Event ID."""
+    games = data_loader.load_dataset('game_odds', data_dir=data_dir)
+    games = games.reindex(columns=['date', 'Sport', 'Home Team', 'Away Team', 'Match Date', 'Event ID'])
+    return games.astype({'date': str, 'Sport': str, 'Home Team': str, 'Away Team': str}).drop_duplicates()
+
+def api_games(data_dir='data'):
+    """One row per game as the-odds-api spells it, from the scores cache, the results files and the unmatched log."""
+    sports = {sport_key: sport for sport, sport_key in SPORT_KEY_MAP.items()}
+    rows = []
+    for path in glob.glob(os.path.join(scores_client.CACHE_DIR, '*.json')):
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        sport = sports.get(entry['key']['sport_key'])
+        for game in entry['payload'] if sport else []:
+            rows.append((entry['key']['date'], sport, game['home_team'], game['away_team'],
+                         scores_client.commence_time_est(game.get('commence_time')), game['id']))
+    columns = ['date', 'Sport', 'Home Team', 'Away Team', 'Commence Time', 'Game ID']
+    results = data_loader.load_dataset('game_results', data_dir=data_dir).reindex(columns=columns)
+    results = results.astype({'date': str, 'Sport': str, 'Home Team': str, 'Away Team': str})
+    frames = [pd.DataFrame(rows, columns=columns), results]
+    unmatched_path = os.path.join(data_dir, os.path.basename(UNMATCHED_FILE))
+    if os.path.exists(unmatched_path):
+        frames.append(pd.read_csv(unmatched_path, dtype=str).reindex(columns=columns))
+    games = pd.concat([frame for frame in frames if not frame.empty], ignore_index=True)
+    return games.drop_duplicates(['date', 'Sport', 'Game ID']).dropna(subset=['Home Team', 'Away Team'])
+
+def paired_spellings(odds, api, max_hours=MATCH_WINDOW_HOURS):
+    """(Sport, odds spelling, API spelling) for every team of a game the two sources both list."""
+    if odds.empty or api.empty:
+        return pd.DataFrame(columns=['Sport', 'Odds Name', 'API Name'])
+    odds = odds.assign(**{'Match Date': pd.to_datetime(odds['Match Date'], errors='coerce')})
+    api = api.assign(**{'Commence Time': pd.to_datetime(api['Commence Time'], errors='coerce')})
+    normalized = {}
+    for frame in (odds, api):
+        for column in ('Home Team', 'Away Team'):
+            names = frame[column].astype(str)
+            normalized.update({name: normalize_name(name) for name in names.unique() if name not in normalized})
+            frame[column + ' Key'] = names.map(normalized)
+    odds['odds row'] = np.arange(len(odds))
+    api['api row'] = np.arange(len(api))
+    # Games listed under the same names by both sources need no alias
+    keys = ['date', 'Sport', 'Home Team Key', 'Away Team Key']
+    odds['named'] = pd.MultiIndex.from_frame(odds[keys]).isin(pd.MultiIndex.from_frame(api[keys]))
+    api['named'] = pd.MultiIndex.from_frame(api[keys]).isin(pd.MultiIndex.from_frame(odds[keys]))
+
+    # The event ID saved with the odds names the API game outright
+    with_ids = odds.dropna(subset=['Event ID']).astype({'Event ID': str})
+    pairs = [with_ids.merge(api.dropna(subset=['Game ID']).astype({'Game ID': str}),
+                            left_on=['Sport', 'Event ID'], right_on=['Sport', 'Game ID'], suffixes=('', ' API'))]
+    # Otherwise a game is the same when the day and one team agree and both kickoffs are known and
+    # close. The day alone is not enough (a tournament team plays on consecutive days), so
+    # without times the other team's spellings must also be alike and neither game matched by name
+    for side, other in (('Home Team Key', 'Away Team Key'), ('Away Team Key', 'Home Team Key')):
+        same_team = odds.merge(api, on=['date', 'Sport', side], suffixes=('', ' API'))
+        gap = (same_team['Match Date'] - same_team['Commence Time']).abs()
+        untimed = gap.isna() & ~same_team['named'] & ~same_team['named API']
+        alike = pd.Series([
+            difflib.SequenceMatcher(None, odds_key, api_key).ratio() >= ALIAS_CUTOFF
+            for odds_key, api_key in zip(same_team.loc[untimed, other], same_team.loc[untimed, other + ' API'])
+        ], index=same_team.index[untimed], dtype=bool)
+        same_team = same_team[(gap <= pd.Timedelta(hours=max_hours)) | alike.reindex(same_team.index, fill_value=False)]
+        # A team listed in two games that day says nothing about its opponent
+        same_team = same_team[~same_team.duplicated('odds row', keep=False) &
+                              ~same_team.duplicated('api row', keep=False)]
+        pairs.append(same_team)
+    pairs = pd.concat(pairs, ignore_index=True)
+
+    spellings = pd.concat([
+        pairs[['Sport', column, column + ' API']].set_axis(['Sport', 'Odds Name', 'API Name'], axis=1)
+        for column in ('Home Team', 'Away Team')
+    ], ignore_index=True)
+    return spellings.astype(str).drop_duplicates()
+
+def build_index(data_dir='data'):
+    """Group every observed spelling into teams; the most common spelling is the canonical one."""
+    counts = observed_names(data_dir)
+    spellings = paired_spellings(odds_games(data_dir), api_games(data_dir))
+
+    # Union-find over (sport, normalized spelling): equal keys are one team, paired keys are joined
+    parent = {}
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+    for sport, name in counts.index:
+        find((sport, normalize_name(name)))
+    for sport, odds_name, api_name in spellings.itertuples(index=False):
+        parent[find((sport, normalize_name(api_name)))] = find((sport, normalize_name(odds_name)))
+
+    # Most common spellings first, so each team's first spelling is its canonical one
+    names = counts.sort_values(ascending=False, kind='stable').index.tolist()
+    names += [(sport, name) for sport, odds_name, api_name in spellings.itertuples(index=False)
+              for name in (odds_name, api_name) if (sport, name) not in counts.index]
+    teams = {}  # root key -> (sport, [spellings])
+    for sport, name in dict.fromkeys(names):
+        teams.setdefault(find((sport, normalize_name(name))), (sport, []))[1].append(name)
+
+    index = TeamIndex()
+    for sport, team_spellings in sorted(teams.values(), key=lambda team: (team[0], team[1][0])):
+        team_id = index.add(sport, team_spellings[0])
+        for spelling in team_spellings[1:]:
+            index.add(sport, spelling, team_id)
+    return index
+
+def rebuild(data_dir='data', path=ALIASES_FILE):
+    index = build_index(data_dir)
+    frame = index.to_frame()
+    with atomic_write(path) as f:
+        frame.to_csv(f, index=False)
+    print(f"Rebuilt {path}: {len(index.names)} teams, {len(frame) - len(index.names)} extra spellings")
+
+def main():
+    parser = argparse.ArgumentParser(description='Team-name alias index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help='Rebuild the index from the odds and results files')
+    lookup_parser = subparsers.add_parser('lookup', help='Show the team ID each spelling resolves to')
+    lookup_parser.add_argument('sport')
+    lookup_parser.add_argument('names', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        rebuild()
+        return
+
+    index = load_index()
+    for name in args.names:
+        team_id = index.match(args.sport, name)
+        print(f"{name}: {team_id if team_id is None else f'{team_id} ({index.names[team_id]})'}")
+
+if __name__ == "__main__":
+    main()